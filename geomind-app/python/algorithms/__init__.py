@@ -3,24 +3,27 @@ QGlS Algorithms - Geoprocessing algorithms using Shapely and optionally PyQGIS
 
 This package provides various spatial analysis algorithms that can be called
 from Node.js via the qgls_processor.py script.
+
+Algorithm modules are imported lazily on first attribute access, so importing
+the package does not pull in Shapely, NumPy or rasterio.
 """
 
-from . import buffer
-from . import dissolve
-from . import simplify
-from . import voronoi
-from . import convex_hull
-from . import centroid
-from . import grid
-from . import clip_raster
+import importlib
 
 __all__ = [
     'buffer',
     'dissolve',
     'simplify',
     'voronoi',
+    'delaunay',
     'convex_hull',
     'centroid',
     'grid',
     'clip_raster'
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
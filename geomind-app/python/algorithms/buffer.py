@@ -2,11 +2,19 @@
 Buffer algorithm - Create buffer zones around geometries
 """
 
-from typing import Any, Dict, Optional
-from shapely import from_geojson, to_geojson
-from shapely.geometry import shape, mapping
-from shapely.ops import unary_union
-import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import shapely
+
+from . import parallel
+from .progress import report
+from .union import union_all
+from .utils import as_shape, geometry_array
+
+# Features buffered per vectorized shapely.buffer call when streaming
+BATCH_SIZE = 1000
 
 
 def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
@@ -14,11 +22,21 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     Create buffer zones around input geometries
 
     Params:
-        distance: Buffer distance in map units (required)
+        distance: Buffer distance in map units (required unless distances or
+            distance_field is set - with distance_field, used for features without a value)
+        distances: List of distances for a multi-ring buffer, e.g. [5, 10, 20]
+        ring_mode: With distances - 'ring' for non-overlapping rings (each buffer minus
+            the previous one) or 'nested' for the full buffers (default: 'ring')
+        distance_field: Property holding a per-feature distance, e.g. a pipe diameter
+        distance_factor: Multiplier applied to distance_field values (default: 1),
+            e.g. 0.0005 to buffer by half a diameter given in mm
         segments: Number of segments for circular approximation (default: 16)
         cap_style: End cap style - 'round', 'flat', 'square' (default: 'round')
         join_style: Join style - 'round', 'mitre', 'bevel' (default: 'round')
         dissolve: Whether to dissolve overlapping buffers (default: False)
+        workers: Worker processes for chunked parallel execution / the partitioned
+            union when dissolving, or 'auto' (default: 1)
+        min_chunk_size: Minimum features per parallel chunk (default: 1000)
 
     Returns:
         GeoJSON FeatureCollection with buffered geometries
@@ -26,62 +44,190 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     if not input_geojson:
         raise ValueError("Input GeoJSON required for buffer operation")
 
-    distance = params.get('distance')
-    if distance is None:
-        raise ValueError("Parameter 'distance' is required")
-
-    distance = float(distance)
-    segments = int(params.get('segments', 16))
-    cap_style = params.get('cap_style', 'round')
-    join_style = params.get('join_style', 'round')
+    options = _buffer_options(params)
     dissolve = params.get('dissolve', False)
 
-    # Map style names to Shapely constants
-    cap_styles = {'round': 1, 'flat': 2, 'square': 3}
-    join_styles = {'round': 1, 'mitre': 2, 'bevel': 3}
-
-    cap = cap_styles.get(cap_style, 1)
-    join = join_styles.get(join_style, 1)
-
     features = input_geojson.get('features', [])
     if not features:
         # Single geometry
-        geom = shape(input_geojson)
-        buffered = geom.buffer(distance, resolution=segments, cap_style=cap, join_style=join)
-        return {
-            'type': 'FeatureCollection',
-            'features': [{
-                'type': 'Feature',
-                'properties': {'buffer_distance': distance},
-                'geometry': mapping(buffered)
-            }]
-        }
+        features = [{'type': 'Feature', 'properties': {}, 'geometry': as_shape(input_geojson)}]
+        dissolve = False
 
-    # Process features
-    buffered_geoms = []
-    buffered_features = []
-
-    for feature in features:
-        geom = shape(feature['geometry'])
-        buffered = geom.buffer(distance, resolution=segments, cap_style=cap, join_style=join)
-        buffered_geoms.append(buffered)
-
-        if not dissolve:
-            buffered_features.append({
-                'type': 'Feature',
-                'properties': {**feature.get('properties', {}), 'buffer_distance': distance},
-                'geometry': mapping(buffered)
-            })
-
-    if dissolve:
-        dissolved = unary_union(buffered_geoms)
+    if dissolve and options['distances']:
+        report(0, len(features), stage='buffer')
+        geoms = geometry_array(features)
+        nested = []
+        for distance in options['distances']:
+            buffered_geoms = shapely.buffer(geoms, distance, **options['style'])
+            report(len(nested), len(options['distances']), stage='union')
+            nested.append(union_all(buffered_geoms, params))
+        rings = _rings(np.array(nested, dtype=object), options)
+        buffered_features = [{
+            'type': 'Feature',
+            'properties': {**_ring_properties(options, k), 'dissolved': True},
+            'geometry': ring
+        } for k, ring in enumerate(rings)]
+    elif dissolve:
+        report(0, len(features), stage='buffer')
+        distances = _distances(features, options)
+        buffered_geoms = shapely.buffer(geometry_array(features), distances, **options['style'])
+        report(0, stage='union')
+        dissolved = union_all(buffered_geoms, params)
+        properties = {'dissolved': True}
+        if options['field'] is None:
+            properties = {'buffer_distance': options['distance'], 'dissolved': True}
         buffered_features = [{
             'type': 'Feature',
-            'properties': {'buffer_distance': distance, 'dissolved': True},
-            'geometry': mapping(dissolved)
+            'properties': properties,
+            'geometry': dissolved
         }]
+    else:
+        buffered_features = list(stream(features, params, {}))
 
     return {
         'type': 'FeatureCollection',
         'features': buffered_features
     }
+
+
+def can_stream(params: Dict[str, Any]) -> bool:
+    """Features are buffered independently unless they are dissolved"""
+    return not params.get('dissolve', False)
+
+
+def stream(features: Iterable[Dict], params: Dict[str, Any], metadata: Dict) -> Iterator[Dict]:
+    """
+    Buffer features as they arrive, one vectorized batch at a time
+
+    Args:
+        features: Iterable of GeoJSON features (may be a lazy reader)
+        params: Same parameters as run() (dissolve is ignored)
+        metadata: Dictionary for collection-level metadata (unused)
+
+    Yields:
+        Buffered GeoJSON features
+    """
+    options = _buffer_options(params)
+    if parallel.enabled(params):
+        yield from parallel.stream_chunks(__name__, features, params, metadata)
+        return
+
+    total = len(features) if hasattr(features, '__len__') else None
+    iterator = iter(features)
+    done = 0
+
+    while True:
+        batch = list(islice(iterator, BATCH_SIZE))
+        if not batch:
+            break
+        report(done, total)
+        if options['distances']:
+            yield from _ring_features(batch, options)
+            done += len(batch)
+            continue
+
+        distances = _distances(batch, options, offset=done)
+        buffered = shapely.buffer(geometry_array(batch), distances, **options['style'])
+        for feature, distance, geom in zip(batch, distances.tolist(), buffered):
+            yield {
+                'type': 'Feature',
+                'properties': {**feature.get('properties', {}), 'buffer_distance': distance},
+                'geometry': geom
+            }
+        done += len(batch)
+
+
+def _buffer_options(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate buffer parameters, returns distance / field / factor and the shapely.buffer style"""
+    distance = params.get('distance')
+    field = params.get('distance_field')
+    distances = params.get('distances')
+    if distances is not None:
+        if not isinstance(distances, list) or not distances:
+            raise ValueError("Parameter 'distances' must be a non-empty list of numbers")
+        if field:
+            raise ValueError("Parameters 'distances' and 'distance_field' cannot be combined")
+        distances = sorted({float(d) for d in distances})
+    elif distance is None and not field:
+        raise ValueError("Parameter 'distance' is required")
+
+    ring_mode = params.get('ring_mode', 'ring')
+    if ring_mode not in ('ring', 'nested'):
+        raise ValueError("Parameter 'ring_mode' must be 'ring' or 'nested'")
+
+    cap_style = params.get('cap_style', 'round')
+    join_style = params.get('join_style', 'round')
+
+    return {
+        'distance': float(distance) if distance is not None else None,
+        'distances': distances,
+        'ring_mode': ring_mode,
+        'field': field or None,
+        'factor': float(params.get('distance_factor', 1)),
+        'style': {
+            'quad_segs': int(params.get('segments', 16)),
+            'cap_style': cap_style if cap_style in ('round', 'flat', 'square') else 'round',
+            'join_style': join_style if join_style in ('round', 'mitre', 'bevel') else 'round',
+        }
+    }
+
+
+def _distances(features: List[Dict], options: Dict[str, Any], offset: int = 0) -> np.ndarray:
+    """Buffer distance of each feature (constant, or from options['field'])"""
+    field = options['field']
+    if field is None:
+        return np.full(len(features), options['distance'])
+
+    default = options['distance']
+    distances = np.empty(len(features))
+    for i, feature in enumerate(features):
+        value = (feature.get('properties') or {}).get(field)
+        if value is None or value == '':
+            if default is None:
+                raise ValueError(f"Feature {offset + i} has no '{field}' value and no default 'distance' is set")
+            distances[i] = default
+            continue
+        try:
+            distances[i] = float(value) * options['factor']
+        except (TypeError, ValueError):
+            raise ValueError(f"Feature {offset + i}: invalid '{field}' value {value!r}") from None
+    return distances
+
+
+def _rings(nested: np.ndarray, options: Dict[str, Any]) -> List[np.ndarray]:
+    """
+    Rings from the nested buffers (one array / geometry per distance)
+
+    Each ring is derived from the previous buffer by difference instead of
+    being buffered again: the nested buffers come from one vectorized call
+    per distance on the shared input geometries (buffering the previous
+    buffer would be slower and drift from the exact distance).
+    """
+    if options['ring_mode'] == 'nested':
+        return list(nested)
+    return [nested[0]] + [shapely.difference(outer, inner) for inner, outer in zip(nested, nested[1:])]
+
+
+def _ring_properties(options: Dict[str, Any], k: int) -> Dict[str, Any]:
+    distances = options['distances']
+    properties = {'buffer_distance': distances[k], 'ring': k + 1}
+    if options['ring_mode'] == 'ring':
+        properties['inner_distance'] = distances[k - 1] if k else 0.0
+    return properties
+
+
+def _ring_features(features: List[Dict], options: Dict[str, Any]) -> Iterator[Dict]:
+    """Multi-ring buffer of a batch of features - one output feature per feature and distance"""
+    geoms = geometry_array(features)
+    nested = np.array([shapely.buffer(geoms, d, **options['style']) for d in options['distances']])
+    rings = _rings(nested, options)
+    ring_properties = [_ring_properties(options, k) for k in range(len(rings))]
+
+    for i, feature in enumerate(features):
+        properties = feature.get('properties', {})
+        for k, ring in enumerate(rings):
+            yield {
+                'type': 'Feature',
+                'properties': {**properties, **ring_properties[k]},
+                'geometry': ring[i]
+            }
@@ -2,8 +2,27 @@
 Centroid algorithm - Calculate centroids of geometries
 """
 
-from typing import Any, Dict, Optional
-from shapely.geometry import shape, mapping
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import shapely
+
+from . import parallel
+from .progress import report
+from .utils import as_shape, geometry_array
+
+# Features handled per vectorized batch when streaming
+BATCH_SIZE = 1000
+
+# Geometry type names by shapely type id (the last entry is for missing geometries, id -1)
+GEOMETRY_TYPES = np.array([
+    'Point', 'LineString', 'LinearRing', 'Polygon', 'MultiPoint',
+    'MultiLineString', 'MultiPolygon', 'GeometryCollection', None
+], dtype=object)
+
+POLYGONAL_TYPES = (3, 6)
+LINEAL_TYPES = (1, 5)
 
 
 def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
@@ -13,6 +32,8 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     Params:
         weighted: Use weighted centroid for polygons (default: False)
         inside: Force centroid to be inside polygon using representative_point (default: False)
+        workers: Worker processes for chunked parallel execution, or 'auto' (default: 1)
+        min_chunk_size: Minimum features per parallel chunk (default: 1000)
 
     Returns:
         GeoJSON FeatureCollection with centroid points
@@ -25,7 +46,7 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
 
     if not features:
         # Single geometry
-        geom = shape(input_geojson)
+        geom = as_shape(input_geojson)
         if inside:
             centroid = geom.representative_point()
         else:
@@ -39,40 +60,81 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
                     'original_type': geom.geom_type,
                     'original_area': round(geom.area, 2) if hasattr(geom, 'area') else None
                 },
-                'geometry': mapping(centroid)
+                'geometry': centroid
             }]
         }
 
-    # Process features
-    result_features = []
+    return {
+        'type': 'FeatureCollection',
+        'features': list(stream(features, params, {}))
+    }
 
-    for feature in features:
-        geom = shape(feature['geometry'])
 
-        if inside:
-            centroid = geom.representative_point()
-        else:
-            centroid = geom.centroid
+def can_stream(params: Dict[str, Any]) -> bool:
+    """Centroids are always computed feature by feature"""
+    return True
+
 
-        props = feature.get('properties', {}).copy()
-        props.update({
-            'original_type': geom.geom_type,
-            'centroid_x': round(centroid.x, 3),
-            'centroid_y': round(centroid.y, 3)
-        })
+def stream(features: Iterable[Dict], params: Dict[str, Any], metadata: Dict) -> Iterator[Dict]:
+    """
+    Calculate centroids as features arrive, one vectorized batch at a time
 
-        if geom.geom_type in ('Polygon', 'MultiPolygon'):
-            props['original_area'] = round(geom.area, 2)
-        if geom.geom_type in ('LineString', 'MultiLineString'):
-            props['original_length'] = round(geom.length, 2)
+    Args:
+        features: Iterable of GeoJSON features (may be a lazy reader)
+        params: Same parameters as run()
+        metadata: Dictionary for collection-level metadata (unused)
 
-        result_features.append({
-            'type': 'Feature',
-            'properties': props,
-            'geometry': mapping(centroid)
-        })
+    Yields:
+        GeoJSON point features
+    """
+    if parallel.enabled(params):
+        yield from parallel.stream_chunks(__name__, features, params, metadata)
+        return
 
-    return {
-        'type': 'FeatureCollection',
-        'features': result_features
-    }
+    inside = params.get('inside', False)
+    total = len(features) if hasattr(features, '__len__') else None
+    iterator = iter(features)
+    done = 0
+
+    while True:
+        batch = list(islice(iterator, BATCH_SIZE))
+        if not batch:
+            break
+        report(done, total)
+        geoms = geometry_array(batch)
+        centroids = shapely.point_on_surface(geoms) if inside else shapely.centroid(geoms)
+
+        type_ids = shapely.get_type_id(geoms)
+        types = GEOMETRY_TYPES[type_ids].tolist()
+        xy = np.full((len(batch), 2), np.nan)
+        valid = ~shapely.is_empty(centroids) & ~shapely.is_missing(centroids)
+        xy[valid] = shapely.get_coordinates(centroids[valid])
+        xs = _column(xy[:, 0], 3)
+        ys = _column(xy[:, 1], 3)
+
+        # Added properties of the whole batch, from the columns
+        added = [
+            {'original_type': t, 'centroid_x': x, 'centroid_y': y}
+            for t, x, y in zip(types, xs, ys)
+        ]
+        areas = _column(shapely.area(geoms), 2)
+        for i in np.flatnonzero(np.isin(type_ids, POLYGONAL_TYPES)).tolist():
+            added[i]['original_area'] = areas[i]
+        lengths = _column(shapely.length(geoms), 2)
+        for i in np.flatnonzero(np.isin(type_ids, LINEAL_TYPES)).tolist():
+            added[i]['original_length'] = lengths[i]
+
+        for feature, centroid, properties in zip(batch, centroids, added):
+            yield {
+                'type': 'Feature',
+                'properties': {**feature.get('properties', {}), **properties},
+                'geometry': centroid
+            }
+        done += len(batch)
+
+
+def _column(values: np.ndarray, decimals: int) -> list:
+    """Rounded values as a list, None where undefined (e.g. the centroid of an empty geometry)"""
+    column = np.round(values, decimals).astype(object)
+    column[np.isnan(values)] = None
+    return column.tolist()
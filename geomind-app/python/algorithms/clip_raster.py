@@ -4,9 +4,11 @@ Note: Requires rasterio/GDAL for full functionality
 """
 
 from typing import Any, Dict, Optional
-from shapely.geometry import shape, mapping
 import os
 
+from .progress import report
+from .utils import as_shape
+
 
 def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     """
@@ -45,9 +47,9 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     # Get clip geometry
     features = input_geojson.get('features', [])
     if features:
-        geoms = [shape(f['geometry']) for f in features]
+        geoms = [as_shape(f['geometry']) for f in features]
     else:
-        geoms = [shape(input_geojson)]
+        geoms = [as_shape(input_geojson)]
 
     # Output path
     output_path = params.get('output_path')
@@ -58,6 +60,7 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     nodata = params.get('nodata', -9999)
 
     # Perform clip
+    report(0, 3, stage='mask')
     with rasterio.open(raster_path) as src:
         out_image, out_transform = mask(src, geoms, crop=True, nodata=nodata)
         out_meta = src.meta.copy()
@@ -70,10 +73,12 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
             "nodata": nodata
         })
 
+        report(1, 3, stage='write')
         with rasterio.open(output_path, "w", **out_meta) as dest:
             dest.write(out_image)
 
         # Calculate statistics
+        report(2, 3, stage='statistics')
         valid_data = out_image[out_image != nodata]
         stats = {
             'min': float(np.min(valid_data)) if len(valid_data) > 0 else None,
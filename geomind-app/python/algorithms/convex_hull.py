@@ -1,10 +1,18 @@
 """
-Convex Hull algorithm - Generate convex hull polygons
+Convex Hull algorithm - Generate convex (or concave) hull polygons
+
+A hull only depends on the input vertices, so the coordinates of all
+features are stacked into one MultiPoint per group and the hulls computed
+in one vectorized call - no union of the input geometries is needed.
 """
 
 from typing import Any, Dict, Optional
-from shapely.geometry import shape, mapping, MultiPoint
-from shapely.ops import unary_union
+
+import numpy as np
+import shapely
+
+from .progress import report
+from .utils import geometry_array
 
 
 def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
@@ -13,9 +21,13 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
 
     Params:
         group_by: Field to group features before calculating hulls (optional)
+        hull_type: 'convex' (default) or 'concave'
+        ratio: Concave hull ratio between 0 (most concave) and 1 (the convex
+            hull), as a fraction of the longest edge length (default: 0.3)
+        allow_holes: Whether concave hulls may contain holes (default: False)
 
     Returns:
-        GeoJSON FeatureCollection with convex hull polygon(s)
+        GeoJSON FeatureCollection with hull polygon(s)
     """
     if not input_geojson:
         raise ValueError("Input GeoJSON required for convex_hull operation")
@@ -26,44 +38,56 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     if not features:
         raise ValueError("No features provided for convex hull")
 
+    hull_type = params.get('hull_type', 'convex')
+    if hull_type not in ('convex', 'concave'):
+        raise ValueError("Parameter 'hull_type' must be 'convex' or 'concave'")
+    ratio = float(params.get('ratio', 0.3))
+    if not 0 <= ratio <= 1:
+        raise ValueError("Parameter 'ratio' must be between 0 and 1")
+
     if group_by:
-        # Group by field
-        from collections import defaultdict
-        groups = defaultdict(list)
-
-        for feature in features:
-            key = feature.get('properties', {}).get(group_by, '__none__')
-            geom = shape(feature['geometry'])
-            groups[key].append(geom)
-
-        result_features = []
-        for key, geoms in groups.items():
-            combined = unary_union(geoms)
-            hull = combined.convex_hull
-
-            result_features.append({
-                'type': 'Feature',
-                'properties': {
-                    group_by: key,
-                    'feature_count': len(geoms),
-                    'hull_area': round(hull.area, 2)
-                },
-                'geometry': mapping(hull)
-            })
+        # Group by field, in order of first appearance
+        keys = {}
+        group = np.array([
+            keys.setdefault(feature.get('properties', {}).get(group_by, '__none__'), len(keys))
+            for feature in features
+        ])
+        keys = list(keys)
     else:
-        # Single hull for all features
-        geoms = [shape(f['geometry']) for f in features]
-        combined = unary_union(geoms)
-        hull = combined.convex_hull
+        group = np.zeros(len(features), dtype=np.int64)
+        keys = [None]
+
+    report(0, len(keys), stage='hull')
+    geoms = geometry_array(features)
+    coords, index = shapely.get_coordinates(geoms, return_index=True)
+    coord_group = group[index]
+    order = np.argsort(coord_group, kind='stable')
+
+    # One MultiPoint per group that has coordinates (indices must be contiguous)
+    present, compact = np.unique(coord_group[order], return_inverse=True)
+    points = shapely.multipoints(coords[order], indices=compact)
+    if hull_type == 'concave':
+        hulls = shapely.concave_hull(points, ratio=ratio, allow_holes=bool(params.get('allow_holes', False)))
+    else:
+        hulls = shapely.convex_hull(points)
+
+    all_hulls = np.full(len(keys), shapely.Polygon(), dtype=object)
+    all_hulls[present] = hulls
+    areas = shapely.area(all_hulls).tolist()
+    counts = np.bincount(group, minlength=len(keys)).tolist()
 
-        result_features = [{
+    result_features = []
+    for i, key in enumerate(keys):
+        properties = {group_by: key} if group_by else {}
+        properties.update({
+            'feature_count': counts[i],
+            'hull_area': round(areas[i], 2)
+        })
+        result_features.append({
             'type': 'Feature',
-            'properties': {
-                'feature_count': len(features),
-                'hull_area': round(hull.area, 2)
-            },
-            'geometry': mapping(hull)
-        }]
+            'properties': properties,
+            'geometry': all_hulls[i]
+        })
 
     return {
         'type': 'FeatureCollection',
@@ -0,0 +1,261 @@
+"""
+Delaunay algorithm - Triangulated irregular network (TIN) from points
+
+The triangulation is computed by GEOS in one call; triangles are then
+handled as NumPy arrays of vertex indices, and Python feature dicts are
+only built for the output. Values are interpolated linearly inside the
+triangles, either summarized per triangle or onto a regular grid.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+import shapely
+
+from .progress import report
+from .utils import geometry_array
+
+# Triangles rasterized per vectorized batch (bounds the candidate-pixel arrays)
+RASTER_BATCH = 20000
+
+# Tolerance on barycentric coordinates, so pixels on shared edges are not lost
+EDGE_EPSILON = 1e-9
+
+
+def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
+    """
+    Triangulate points (Delaunay) and optionally interpolate a value
+
+    Params:
+        field: Numeric property to interpolate, or '$z' for the point Z (optional)
+        output: 'triangles' (default) or 'raster' - a grid interpolated linearly
+            inside the triangles (requires field and cell_size)
+        cell_size: Raster cell size in map units
+        extent: Raster extent as [minx, miny, maxx, maxy] (default: points extent)
+        max_edge_length: Drop triangles with a longer edge, e.g. across the
+            concave parts of the network's outline (optional)
+
+    Returns:
+        GeoJSON FeatureCollection of triangle polygons (vertex ids, value
+        min/max/mean), or for 'raster' an empty FeatureCollection with a
+        'raster' member: width, height, cell_size, extent, nodata and the
+        values row by row from the north (null = outside the TIN)
+    """
+    if not input_geojson:
+        raise ValueError("Input GeoJSON required for delaunay operation")
+
+    features = input_geojson.get('features', [])
+    if not features:
+        raise ValueError("No features provided for Delaunay triangulation")
+
+    field = params.get('field')
+    output = params.get('output', 'triangles')
+    if output not in ('triangles', 'raster'):
+        raise ValueError("Parameter 'output' must be 'triangles' or 'raster'")
+    if output == 'raster' and not field:
+        raise ValueError("Parameter 'field' is required for raster output")
+
+    report(0, stage='triangulate')
+    xy, values, source, skipped = _points(features, field)
+    xy, first = np.unique(xy, axis=0, return_index=True)
+    duplicates = len(source) - len(xy)
+    source, values = source[first], (values[first] if values is not None else None)
+    if len(xy) < 3:
+        raise ValueError("At least 3 distinct points required for Delaunay triangulation")
+
+    triangles, polygons = _triangulate(xy)
+    if params.get('max_edge_length') is not None:
+        keep = _max_edge(xy, triangles) <= float(params['max_edge_length'])
+        triangles, polygons = triangles[keep], polygons[keep]
+
+    metadata = {
+        'input_points': len(xy),
+        'triangles': len(triangles),
+    }
+    if duplicates:
+        metadata['duplicate_points'] = duplicates
+    if skipped:
+        metadata['skipped_points'] = skipped
+
+    if output == 'raster':
+        raster = _raster(xy, values, triangles, params)
+        metadata['filled_cells'] = raster.pop('filled_cells')
+        return {
+            'type': 'FeatureCollection',
+            'features': [],
+            'raster': raster,
+            'metadata': metadata
+        }
+
+    return {
+        'type': 'FeatureCollection',
+        'features': _triangle_features(features, source, values, triangles, polygons, field),
+        'metadata': metadata
+    }
+
+
+def _points(features, field):
+    """
+    Vertex coordinates, values and source feature index of the input points
+
+    MultiPoints give all their points, other geometries their centroid. With
+    a field, points without a numeric value are left out (and counted).
+    """
+    geoms = geometry_array(features)
+    types = shapely.get_type_id(geoms)
+    other = (types != 0) & (types != 4) & ~shapely.is_missing(geoms)
+    geoms[other] = shapely.centroid(geoms[other])
+    points, source = shapely.get_parts(geoms, return_index=True)
+    keep = ~shapely.is_empty(points)
+    points, source = points[keep], source[keep]
+    xy = shapely.get_coordinates(points)
+
+    values = None
+    skipped = 0
+    if field:
+        if field == '$z':
+            values = shapely.get_z(points)
+        else:
+            raw = [(features[i].get('properties') or {}).get(field) for i in source.tolist()]
+            values = np.array([_number(v) for v in raw], dtype=float)
+        valid = ~np.isnan(values)
+        skipped = int((~valid).sum())
+        xy, values, source = xy[valid], values[valid], source[valid]
+    return xy, values, source, skipped
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _triangulate(xy: np.ndarray):
+    """Delaunay triangles as (n, 3) vertex indices into xy, plus their polygons"""
+    polygons = shapely.get_parts(shapely.delaunay_triangles(shapely.multipoints(xy)))
+    if not len(polygons):
+        raise ValueError("Points are collinear - no triangle can be formed")
+
+    # GEOS keeps the input coordinates exactly: map triangle corners back to
+    # point indices by finding them among the (unique) input points
+    corners = shapely.get_coordinates(polygons).reshape(len(polygons), 4, 2)[:, :3].reshape(-1, 2)
+    _, inverse = np.unique(np.vstack([xy, corners]), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    point_of = np.empty(inverse[:len(xy)].max() + 1, dtype=np.int64)
+    point_of[inverse[:len(xy)]] = np.arange(len(xy))
+    triangles = point_of[inverse[len(xy):]].reshape(-1, 3)
+    return triangles, polygons
+
+
+def _max_edge(xy: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    a, b, c = xy[triangles[:, 0]], xy[triangles[:, 1]], xy[triangles[:, 2]]
+    return np.maximum.reduce([
+        np.hypot(*(a - b).T), np.hypot(*(b - c).T), np.hypot(*(c - a).T)
+    ])
+
+
+def _triangle_features(features, source, values, triangles, polygons, field):
+    ids = np.array([features[i].get('id', i) for i in source.tolist()], dtype=object)
+    vertex_ids = ids[triangles].tolist()
+    areas = np.round(shapely.area(polygons), 2).tolist()
+
+    stats = None
+    if values is not None:
+        corner_values = values[triangles]
+        name = field.lstrip('$')
+        stats = {
+            f'{name}_min': np.round(corner_values.min(axis=1), 3).tolist(),
+            f'{name}_max': np.round(corner_values.max(axis=1), 3).tolist(),
+            f'{name}_mean': np.round(corner_values.mean(axis=1), 3).tolist(),
+        }
+
+    result_features = []
+    for i, polygon in enumerate(polygons):
+        properties = {
+            'triangle_id': i,
+            'vertices': vertex_ids[i],
+            'area': areas[i]
+        }
+        if stats:
+            properties.update({key: column[i] for key, column in stats.items()})
+        result_features.append({
+            'type': 'Feature',
+            'properties': properties,
+            'geometry': polygon
+        })
+    return result_features
+
+
+def _raster(xy: np.ndarray, values: np.ndarray, triangles: np.ndarray, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Linear interpolation of values inside the triangles onto a north-up grid"""
+    cell_size = params.get('cell_size')
+    if cell_size is None:
+        raise ValueError("Parameter 'cell_size' is required for raster output")
+    cell_size = float(cell_size)
+    if cell_size <= 0:
+        raise ValueError("Parameter 'cell_size' must be positive")
+
+    extent = params.get('extent') or [*xy.min(axis=0), *xy.max(axis=0)]
+    minx, miny, maxx, maxy = (float(v) for v in extent)
+    width = max(1, math.ceil((maxx - minx) / cell_size))
+    height = max(1, math.ceil((maxy - miny) / cell_size))
+    grid = np.full((height, width), np.nan)
+
+    a, b, c = xy[triangles[:, 0]], xy[triangles[:, 1]], xy[triangles[:, 2]]
+    low = np.minimum(np.minimum(a, b), c)
+    high = np.maximum(np.maximum(a, b), c)
+
+    # Range of pixel centres inside each triangle's bounding box
+    col0 = np.clip(np.ceil((low[:, 0] - minx) / cell_size - 0.5), 0, None).astype(np.int64)
+    col1 = np.clip(np.floor((high[:, 0] - minx) / cell_size - 0.5), None, width - 1).astype(np.int64)
+    row0 = np.clip(np.ceil((maxy - high[:, 1]) / cell_size - 0.5), 0, None).astype(np.int64)
+    row1 = np.clip(np.floor((maxy - low[:, 1]) / cell_size - 0.5), None, height - 1).astype(np.int64)
+    ncols = np.maximum(col1 - col0 + 1, 0)
+    counts = ncols * np.maximum(row1 - row0 + 1, 0)
+
+    for start in range(0, len(triangles), RASTER_BATCH):
+        report(start, len(triangles), stage='interpolate')
+        t = np.arange(start, min(start + RASTER_BATCH, len(triangles)))
+        t = t[counts[t] > 0]
+        if not len(t):
+            continue
+
+        # One candidate per (triangle, pixel of its bounding box)
+        tri = np.repeat(t, counts[t])
+        offset = np.arange(len(tri)) - np.repeat(np.cumsum(counts[t]) - counts[t], counts[t])
+        rows = row0[tri] + offset // ncols[tri]
+        cols = col0[tri] + offset % ncols[tri]
+        px = minx + (cols + 0.5) * cell_size
+        py = maxy - (rows + 0.5) * cell_size
+
+        # Barycentric coordinates of the pixel centres
+        ax, ay = a[tri, 0], a[tri, 1]
+        v0x, v0y = b[tri, 0] - ax, b[tri, 1] - ay
+        v1x, v1y = c[tri, 0] - ax, c[tri, 1] - ay
+        v2x, v2y = px - ax, py - ay
+        den = v0x * v1y - v1x * v0y
+        with np.errstate(divide='ignore', invalid='ignore'):
+            l1 = (v2x * v1y - v1x * v2y) / den
+            l2 = (v0x * v2y - v2x * v0y) / den
+        l0 = 1 - l1 - l2
+        inside = (l0 >= -EDGE_EPSILON) & (l1 >= -EDGE_EPSILON) & (l2 >= -EDGE_EPSILON)
+
+        corner = values[triangles[tri[inside]]]
+        grid[rows[inside], cols[inside]] = (
+            l0[inside] * corner[:, 0] + l1[inside] * corner[:, 1] + l2[inside] * corner[:, 2]
+        )
+
+    cells = np.round(grid, 3).astype(object)
+    cells[np.isnan(grid)] = None
+    return {
+        'width': width,
+        'height': height,
+        'cell_size': cell_size,
+        'extent': [minx, maxy - height * cell_size, minx + width * cell_size, maxy],
+        'nodata': None,
+        'filled_cells': int((~np.isnan(grid)).sum()),
+        'values': cells.tolist()
+    }
+
@@ -1,12 +1,46 @@
 """
-Dissolve algorithm - Merge geometries based on attribute or all together
+Dissolve algorithm - Merge geometries based on attributes or all together
 """
 
-from typing import Any, Dict, Optional
-from shapely.geometry import shape, mapping
-from shapely.ops import unary_union
+import json
+from typing import Any, Callable, Dict, List, Optional
 from collections import defaultdict
 
+import numpy as np
+import shapely
+
+from .progress import report
+from .union import union_all, union_groups
+from .utils import as_shape, geometry_array
+
+# Group value of features without the field
+MISSING = '__none__'
+
+# Pseudo-fields measured on each feature's geometry
+GEOMETRY_FIELDS = {
+    '$length': lambda geom: geom.length,
+    '$area': lambda geom: geom.area,
+}
+
+
+def _sum(values: List[Any]) -> Any:
+    return sum(values) if values else None
+
+
+def _mean(values: List[Any]) -> Any:
+    return sum(values) / len(values) if values else None
+
+
+AGGREGATES: Dict[str, Callable[[List[Any]], Any]] = {
+    'sum': _sum,
+    'min': lambda values: min(values) if values else None,
+    'max': lambda values: max(values) if values else None,
+    'mean': _mean,
+    'first': lambda values: values[0] if values else None,
+    'count': len,
+    'count_distinct': lambda values: len({_hashable(v) for v in values}),
+}
+
 
 def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     """
@@ -14,6 +48,17 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
 
     Params:
         field: Attribute field to group by (optional - if not provided, dissolves all)
+        fields: Several attribute fields to group by, e.g. ['material', 'diameter']
+        mode: 'group' to merge each whole group (default) or 'adjacent' to merge only
+            geometries that touch or overlap (within a group) - each connected set
+            becomes one feature listing its 'source_ids' (feature id, else index)
+        aggregates: Property -> aggregate function (or list of functions) computed
+            per group, output as '<property>_<function>', e.g.
+            {"$length": "sum", "year": ["min", "max"]}. Functions: sum, min, max,
+            mean, first, count, count_distinct (null values are skipped). The
+            pseudo-properties $length and $area measure each feature's geometry.
+        workers: Worker processes for dissolving groups in parallel, or 'auto' (default: 1)
+        min_chunk_size: Geometries per parallel task (default: 1000)
 
     Returns:
         GeoJSON FeatureCollection with dissolved geometries
@@ -21,38 +66,185 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     if not input_geojson:
         raise ValueError("Input GeoJSON required for dissolve operation")
 
-    field = params.get('field')
+    fields = _group_fields(params)
+    aggregates = _aggregate_specs(params.get('aggregates'))
+    mode = params.get('mode', 'group')
+    if mode not in ('group', 'adjacent'):
+        raise ValueError("Parameter 'mode' must be 'group' or 'adjacent'")
     features = input_geojson.get('features', [])
 
     if not features:
         return input_geojson
 
-    if field:
-        # Group by field value
+    if mode == 'adjacent':
+        return _dissolve_adjacent(features, fields, aggregates, params)
+
+    if fields:
+        # Group by field values, in order of first appearance
         groups = defaultdict(list)
         for feature in features:
-            key = feature.get('properties', {}).get(field, '__none__')
-            groups[key].append(shape(feature['geometry']))
+            groups[_group_key(feature, fields)].append(feature)
+
+        members = list(groups.values())
+        geoms = [[as_shape(f['geometry']) for f in group] for group in members]
+        dissolved = union_groups(geoms, params)
 
         result_features = []
-        for key, geoms in groups.items():
-            dissolved = unary_union(geoms)
+        for group, geometry in zip(members, dissolved):
+            properties = _group_properties(group, fields, aggregates)
             result_features.append({
                 'type': 'Feature',
-                'properties': {field: key, 'dissolved_count': len(geoms)},
-                'geometry': mapping(dissolved)
+                'properties': properties,
+                'geometry': geometry
             })
     else:
         # Dissolve all
-        geoms = [shape(f['geometry']) for f in features]
-        dissolved = unary_union(geoms)
+        geoms = [as_shape(f['geometry']) for f in features]
+        report(0, stage='union')
+        dissolved = union_all(geoms, params)
+        properties = {'dissolved_count': len(geoms)}
+        properties.update(_aggregate(features, aggregates))
         result_features = [{
             'type': 'Feature',
-            'properties': {'dissolved_count': len(geoms)},
-            'geometry': mapping(dissolved)
+            'properties': properties,
+            'geometry': dissolved
         }]
 
     return {
         'type': 'FeatureCollection',
         'features': result_features
     }
+
+
+def _dissolve_adjacent(features: List[Dict], fields: List[str], aggregates: List[tuple],
+                       params: Dict[str, Any]) -> Dict:
+    """
+    Merge only geometries that intersect, directly or through each other
+
+    Intersecting pairs come from one bulk STRtree query; connected
+    components (within a group when fields are given) are then unioned
+    separately, and isolated features are passed through unchanged.
+    """
+    report(0, len(features), stage='index')
+    geoms = geometry_array(features)
+    left, right = shapely.STRtree(geoms).query(geoms, predicate='intersects')
+
+    pairs = left < right
+    if fields:
+        keys = {}
+        group = np.array([keys.setdefault(_group_key(f, fields), len(keys)) for f in features])
+        pairs &= group[left] == group[right]
+    components = _connected_components(len(features), left[pairs], right[pairs])
+
+    merged = [c for c in components if len(c) > 1]
+    dissolved = iter(union_groups([geoms[c] for c in merged], params))
+
+    result_features = []
+    for component in components:
+        members = [features[i] for i in component]
+        properties = _group_properties(members, fields, aggregates)
+        properties['source_ids'] = [features[i].get('id', i) for i in component]
+        result_features.append({
+            'type': 'Feature',
+            'properties': properties,
+            'geometry': next(dissolved) if len(component) > 1 else geoms[component[0]]
+        })
+
+    return {
+        'type': 'FeatureCollection',
+        'features': result_features
+    }
+
+
+def _connected_components(n: int, left: np.ndarray, right: np.ndarray) -> List[List[int]]:
+    """Connected components of the graph 0..n-1 with edges (left[i], right[i]), in order of first member"""
+    parent = list(range(n))
+
+    def find(i):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    for a, b in zip(left.tolist(), right.tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    components = defaultdict(list)
+    for i in range(n):
+        components[find(i)].append(i)
+    return list(components.values())
+
+
+def _group_key(feature: Dict, fields: List[str]) -> tuple:
+    properties = feature.get('properties') or {}
+    return tuple(_hashable(properties.get(f, MISSING)) for f in fields)
+
+
+def _group_properties(group: List[Dict], fields: List[str], aggregates: List[tuple]) -> Dict[str, Any]:
+    """Group field values, member count and aggregates of a dissolved group"""
+    first = group[0].get('properties') or {}
+    properties = {f: first.get(f, MISSING) for f in fields}
+    properties['dissolved_count'] = len(group)
+    properties.update(_aggregate(group, aggregates))
+    return properties
+
+
+def _group_fields(params: Dict[str, Any]) -> List[str]:
+    fields = params.get('fields')
+    if fields is None:
+        field = params.get('field')
+        return [field] if field else []
+    if isinstance(fields, str):
+        return [fields]
+    if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+        raise ValueError("Parameter 'fields' must be a list of field names")
+    return fields
+
+
+def _aggregate_specs(aggregates: Any) -> List[tuple]:
+    """Validate params['aggregates'], returns [(property, function name), ...]"""
+    if not aggregates:
+        return []
+    if not isinstance(aggregates, dict):
+        raise ValueError("Parameter 'aggregates' must map property names to aggregate functions")
+
+    specs = []
+    for name, functions in aggregates.items():
+        for function in functions if isinstance(functions, list) else [functions]:
+            if function not in AGGREGATES:
+                raise ValueError(
+                    f"Unknown aggregate function '{function}' for '{name}'. "
+                    f"Available: {', '.join(AGGREGATES)}"
+                )
+            specs.append((name, function))
+    return specs
+
+
+def _aggregate(features: List[Dict], specs: List[tuple]) -> Dict[str, Any]:
+    """Aggregated properties of one group"""
+    result = {}
+    for name, function in specs:
+        if name in GEOMETRY_FIELDS:
+            measure = GEOMETRY_FIELDS[name]
+            values = [measure(as_shape(f['geometry'])) for f in features if f.get('geometry') is not None]
+        else:
+            values = [v for v in ((f.get('properties') or {}).get(name) for f in features) if v is not None]
+        try:
+            value = AGGREGATES[function](values)
+        except TypeError as e:
+            raise ValueError(f"Cannot compute {function} of '{name}': {e}") from None
+        if name in GEOMETRY_FIELDS and isinstance(value, float):
+            value = round(value, 3)
+        result[f"{name.lstrip('$')}_{function}"] = value
+    return result
+
+
+def _hashable(value: Any) -> Any:
+    """Group key / distinct value for any property value (lists and objects by content)"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True)
+    return value
@@ -3,10 +3,13 @@ Grid algorithm - Generate regular grids (rectangular, hexagonal)
 """
 
 from typing import Any, Dict, Optional
-from shapely.geometry import shape, mapping, box, Polygon
+from shapely.geometry import box, Polygon
 from shapely.ops import unary_union
 import math
 
+from .progress import report
+from .utils import as_shape
+
 
 def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     """
@@ -36,12 +39,12 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     if input_geojson:
         features = input_geojson.get('features', [])
         if features:
-            geoms = [shape(f['geometry']) for f in features]
+            geoms = [as_shape(f['geometry']) for f in features]
             clip_geom = unary_union(geoms)
             bounds = clip_geom.bounds
             extent = list(bounds)
         else:
-            geom = shape(input_geojson)
+            geom = as_shape(input_geojson)
             clip_geom = geom
             extent = list(geom.bounds)
 
@@ -61,6 +64,7 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     # Clip to input geometry if requested
     result_features = []
     for i, cell in enumerate(cells):
+        report(i, len(cells), stage='clip' if clip else 'cells')
         if clip and clip_geom:
             if not cell.intersects(clip_geom):
                 continue
@@ -75,7 +79,7 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
                 'cell_id': i,
                 'cell_area': round(cell.area, 2)
             },
-            'geometry': mapping(cell)
+            'geometry': cell
         })
 
     return {
@@ -98,6 +102,7 @@ def generate_rectangular_grid(minx, miny, maxx, maxy, width, height):
         while y < maxy:
             cell = box(x, y, min(x + width, maxx), min(y + height, maxy))
             cells.append(cell)
+            report(len(cells), stage='generate')
             y += height
         x += width
     return cells
@@ -125,6 +130,7 @@ def generate_hexagonal_grid(minx, miny, maxx, maxy, size):
         while y < maxy + h:
             hex_cell = create_hexagon(x, y, size)
             cells.append(hex_cell)
+            report(len(cells), stage='generate')
             y += row_step
             row += 1
 
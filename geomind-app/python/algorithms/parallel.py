@@ -0,0 +1,174 @@
+"""
+Chunked parallel execution for per-feature algorithms
+
+With params {"workers": N} (or "auto" for one per CPU), the stream() of
+buffer, simplify and centroid splits its features into chunks of at least
+`min_chunk_size` features (default: MIN_CHUNK_SIZE), runs them on N
+processes and yields the results in input order:
+
+    def stream(features, params, metadata):
+        if parallel.enabled(params):
+            yield from parallel.stream_chunks(__name__, features, params, metadata)
+            return
+        ...
+
+Only a bounded number of chunks is in flight, so a lazy input (e.g. a
+FeatureReader) is still read incrementally. Inside a daemonic process (a
+--pool worker, which may not have children) threads are used instead -
+GEOS operations release the GIL, the per-feature Python code does not.
+
+Executors are kept between jobs so a --serve process only pays the worker
+start-up once.
+"""
+
+import importlib
+import math
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .progress import MIN_INTERVAL, report
+
+# Smallest chunk handed to a worker - below this, scheduling overhead dominates
+MIN_CHUNK_SIZE = 1000
+
+# Chunks submitted per worker ahead of the one being consumed
+CHUNKS_PER_WORKER = 2
+
+_executors: Dict[Tuple[str, int], Any] = {}
+
+
+def worker_count(params: Dict[str, Any]) -> int:
+    """Number of workers requested by params['workers'] (1 = serial)"""
+    workers = params.get('workers')
+    if workers is None or workers is False:
+        return 1
+    if workers == 'auto':
+        return os.cpu_count() or 1
+    try:
+        workers = int(workers)
+    except (TypeError, ValueError):
+        raise ValueError("Parameter 'workers' must be a positive integer or 'auto'") from None
+    if workers < 1:
+        raise ValueError("Parameter 'workers' must be a positive integer or 'auto'")
+    return workers
+
+
+def min_chunk_size(params: Dict[str, Any]) -> int:
+    size = int(params.get('min_chunk_size', MIN_CHUNK_SIZE))
+    if size < 1:
+        raise ValueError("Parameter 'min_chunk_size' must be a positive integer")
+    return size
+
+
+def enabled(params: Dict[str, Any]) -> bool:
+    """Whether params ask for parallel execution"""
+    return worker_count(params) > 1
+
+
+def stream_chunks(module_name: str, features: Iterable[Dict], params: Dict[str, Any], metadata: Dict,
+                  merge: Optional[Callable[[Dict, Dict], None]] = None) -> Iterator[Dict]:
+    """
+    Run module.stream() over chunks of features in parallel, yielding results in order
+
+    Inputs too small for two chunks are processed serially in this process.
+
+    Args:
+        module_name: Algorithm module whose stream() processes each chunk
+        features: Iterable of GeoJSON features (may be a lazy reader)
+        params: Algorithm parameters (incl. workers / min_chunk_size)
+        metadata: Collection-level metadata, merged from all chunks
+        merge: merge(metadata, chunk_metadata) - default: dict.update
+    """
+    workers = worker_count(params)
+    min_size = min_chunk_size(params)
+    module = importlib.import_module(module_name)
+    serial = {**params, 'workers': 1}
+
+    total = len(features) if hasattr(features, '__len__') else None
+    if total is not None and total < 2 * min_size:
+        yield from module.stream(features, serial, metadata)
+        return
+
+    # Spread a known input over a few chunks per worker, for load balancing
+    size = min_size
+    if total is not None:
+        size = max(min_size, math.ceil(total / (workers * CHUNKS_PER_WORKER * 2)))
+
+    merge = merge or (lambda target, chunk: target.update(chunk))
+    executor = get_executor(workers)
+    chunks = _chunks(features, size)
+    pending = deque()
+
+    def submit() -> bool:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        pending.append(executor.submit(_run_chunk, module_name, chunk, serial))
+        return True
+
+    for _ in range(workers * CHUNKS_PER_WORKER):
+        if not submit():
+            break
+
+    done = 0
+    try:
+        while pending:
+            future = pending[0]
+            while not future.done():
+                report(done, total)
+                wait([future], timeout=MIN_INTERVAL)
+            pending.popleft()
+            chunk_features, chunk_metadata = future.result()
+            submit()
+            merge(metadata, chunk_metadata)
+            done += len(chunk_features)
+            report(done, total)
+            yield from chunk_features
+    except BrokenExecutor:
+        discard_executor(workers)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _chunks(features: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    iterator = iter(features)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_chunk(module_name: str, features: List[Dict], params: Dict[str, Any]):
+    """Worker side: process one chunk, returns (features, metadata)"""
+    metadata = {}
+    result = list(importlib.import_module(module_name).stream(features, params, metadata))
+    return result, metadata
+
+
+def _executor_key(workers: int) -> Tuple[str, int]:
+    return 'thread' if multiprocessing.current_process().daemon else 'process', workers
+
+
+def get_executor(workers: int):
+    """Shared executor with `workers` workers (processes, or threads in a daemonic process)"""
+    key = _executor_key(workers)
+    executor = _executors.get(key)
+    if executor is None:
+        if key[0] == 'thread':
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='qgls-chunk')
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        _executors[key] = executor
+    return executor
+
+
+def discard_executor(workers: int):
+    """Forget a broken executor (e.g. a worker killed by the OOM killer)"""
+    _executors.pop(_executor_key(workers), None)
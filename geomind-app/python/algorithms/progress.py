@@ -0,0 +1,113 @@
+"""
+Progress reporting and cooperative cancellation for long-running algorithms
+
+Algorithms call report() from their loops. Outside a tracked job this is a
+no-op; inside one (see qgls_processor) it emits throttled progress events
+and raises JobCancelled once the job has been cancelled:
+
+    for i, feature in enumerate(features):
+        report(i, len(features))
+        ...
+
+Cancellation is checked at most every MIN_INTERVAL seconds, so a single
+long GEOS call (e.g. one unary_union) cannot be interrupted - the worker
+pool kills such jobs after a grace period instead.
+
+Only the thread that started tracking a job reports for it: calls from
+helper threads (e.g. parallel chunks) are ignored.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+# Minimum delay between two progress events / cancellation checks (seconds)
+MIN_INTERVAL = 0.25
+
+
+class JobCancelled(Exception):
+    """Raised inside an algorithm when its job has been cancelled"""
+
+    def __init__(self):
+        super().__init__('Job cancelled')
+
+
+class Progress:
+    """
+    Progress of one job
+
+    Args:
+        emit: Called with each progress event dict (None = no events)
+        cancelled: Returns True once the job should stop (None = not cancellable)
+    """
+
+    def __init__(self, emit: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 cancelled: Optional[Callable[[], bool]] = None):
+        self.emit = emit
+        self.cancelled = cancelled
+        self.active = emit is not None or cancelled is not None
+        self.stage: Optional[str] = None
+        self.step: Optional[str] = None
+        self.thread: Optional[int] = None
+        self._next = 0.0
+
+    def begin_step(self, step: Optional[str]):
+        """Start a pipeline step - events then carry its name"""
+        self.step = step
+        self.stage = None
+        self._next = 0.0
+
+    def update(self, processed: int, total: Optional[int] = None, stage: Optional[str] = None):
+        if not self.active or (self.thread is not None and threading.get_ident() != self.thread):
+            return
+        if stage is not None and stage != self.stage:
+            self.stage = stage
+            self._next = 0.0
+        now = time.monotonic()
+        if now < self._next:
+            return
+        self._next = now + MIN_INTERVAL
+
+        if self.cancelled is not None and self.cancelled():
+            raise JobCancelled()
+        if self.emit is not None:
+            event = {'processed': processed}
+            if total:
+                event['total'] = total
+                event['fraction'] = round(min(processed / total, 1.0), 4)
+            if self.stage:
+                event['stage'] = self.stage
+            if self.step:
+                event['step'] = self.step
+            self.emit(event)
+
+    def check(self):
+        """Raise JobCancelled if the job has been cancelled (not throttled)"""
+        if self.cancelled is not None and self.cancelled():
+            raise JobCancelled()
+
+
+_current = Progress()
+
+
+@contextmanager
+def tracking(progress: Progress):
+    """Make `progress` the target of report() for the duration of a job"""
+    global _current
+    previous = _current
+    _current = progress
+    progress.thread = threading.get_ident()
+    try:
+        yield progress
+    finally:
+        _current = previous
+
+
+def current() -> Progress:
+    return _current
+
+
+def report(processed: int, total: Optional[int] = None, stage: Optional[str] = None):
+    """Report progress of the current job (may raise JobCancelled)"""
+    _current.update(processed, total, stage)
@@ -2,8 +2,17 @@
 Simplify algorithm - Reduce geometry complexity while preserving shape
 """
 
-from typing import Any, Dict, Optional
-from shapely.geometry import shape, mapping
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import shapely
+
+from . import parallel
+from .progress import report
+from .utils import as_shape, geometry_array
+
+# Features simplified per vectorized shapely.simplify call when streaming
+BATCH_SIZE = 1000
 
 
 def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
@@ -11,8 +20,14 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     Simplify geometries using Douglas-Peucker algorithm
 
     Params:
-        tolerance: Simplification tolerance in map units (required)
+        tolerance: Simplification tolerance in map units (required unless tolerances is set)
+        tolerances: List of tolerances for a level-of-detail pyramid, e.g. [0.5, 2, 8] -
+            every feature is output once per level (consecutively, finest first), with
+            'lod' (0 = finest) and 'tolerance' properties; metadata 'levels' holds
+            per-level vertex totals
         preserve_topology: Whether to preserve topology (default: True)
+        workers: Worker processes for chunked parallel execution, or 'auto' (default: 1)
+        min_chunk_size: Minimum features per parallel chunk (default: 1000)
 
     Returns:
         GeoJSON FeatureCollection with simplified geometries
@@ -20,20 +35,23 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     if not input_geojson:
         raise ValueError("Input GeoJSON required for simplify operation")
 
-    tolerance = params.get('tolerance')
-    if tolerance is None:
-        raise ValueError("Parameter 'tolerance' is required")
-
-    tolerance = float(tolerance)
-    preserve_topology = params.get('preserve_topology', True)
-
+    tolerances = _tolerances(params)
     features = input_geojson.get('features', [])
+    if not features and tolerances:
+        features = [{'type': 'Feature', 'properties': {}, 'geometry': as_shape(input_geojson)}]
 
     if not features:
+        tolerance = params.get('tolerance')
+        if tolerance is None:
+            raise ValueError("Parameter 'tolerance' is required")
+
+        tolerance = float(tolerance)
+        preserve_topology = params.get('preserve_topology', True)
+
         # Single geometry
-        geom = shape(input_geojson)
+        geom = as_shape(input_geojson)
         original_coords = count_coordinates(geom)
-        simplified = geom.simplify(tolerance, preserve_topology=preserve_topology)
+        simplified = shapely.simplify(geom, tolerance, preserve_topology=preserve_topology)
         new_coords = count_coordinates(simplified)
 
         return {
@@ -46,65 +64,193 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
                     'simplified_vertices': new_coords,
                     'reduction_percent': round((1 - new_coords / max(original_coords, 1)) * 100, 1)
                 },
-                'geometry': mapping(simplified)
+                'geometry': simplified
             }]
         }
 
-    # Process features
-    result_features = []
+    metadata = {}
+    result_features = list(stream(features, params, metadata))
+
+    return {
+        'type': 'FeatureCollection',
+        'features': result_features,
+        'metadata': metadata
+    }
+
+
+def can_stream(params: Dict[str, Any]) -> bool:
+    """Features are always simplified independently"""
+    return True
+
+
+def stream(features: Iterable[Dict], params: Dict[str, Any], metadata: Dict) -> Iterator[Dict]:
+    """
+    Simplify features one at a time as they arrive
+
+    Args:
+        features: Iterable of GeoJSON features (may be a lazy reader)
+        params: Same parameters as run()
+        metadata: Filled with vertex totals once all features are consumed
+
+    Yields:
+        Simplified GeoJSON features
+    """
+    tolerances = _tolerances(params)
+    tolerance = params.get('tolerance')
+    if tolerance is None and not tolerances:
+        raise ValueError("Parameter 'tolerance' is required")
+
+    preserve_topology = params.get('preserve_topology', True)
+    if parallel.enabled(params):
+        yield from parallel.stream_chunks(__name__, features, params, metadata, merge=merge_metadata)
+        return
+    if tolerances:
+        yield from _stream_levels(features, tolerances, preserve_topology, metadata)
+        return
+
+    tolerance = float(tolerance)
+
     total_original = 0
     total_simplified = 0
+    total = len(features) if hasattr(features, '__len__') else None
+    iterator = iter(features)
+    done = 0
 
-    for feature in features:
-        geom = shape(feature['geometry'])
-        original_coords = count_coordinates(geom)
-        simplified = geom.simplify(tolerance, preserve_topology=preserve_topology)
-        new_coords = count_coordinates(simplified)
+    while True:
+        batch = list(islice(iterator, BATCH_SIZE))
+        if not batch:
+            break
+        report(done, total)
+        geoms = geometry_array(batch)
+        simplified = shapely.simplify(geoms, tolerance, preserve_topology=preserve_topology)
+        original_coords = shapely.get_num_coordinates(geoms)
+        new_coords = shapely.get_num_coordinates(simplified)
+
+        total_original += int(original_coords.sum())
+        total_simplified += int(new_coords.sum())
+
+        for feature, geom, original, new in zip(batch, simplified, original_coords.tolist(), new_coords.tolist()):
+            props = feature.get('properties', {}).copy()
+            props.update({
+                'original_vertices': original,
+                'simplified_vertices': new
+            })
 
-        total_original += original_coords
-        total_simplified += new_coords
+            yield {
+                'type': 'Feature',
+                'properties': props,
+                'geometry': geom
+            }
+        done += len(batch)
+
+    metadata.update({
+        'tolerance': tolerance,
+        'total_original_vertices': total_original,
+        'total_simplified_vertices': total_simplified,
+        'reduction_percent': round((1 - total_simplified / max(total_original, 1)) * 100, 1)
+    })
 
-        props = feature.get('properties', {}).copy()
-        props.update({
-            'original_vertices': original_coords,
-            'simplified_vertices': new_coords
-        })
 
-        result_features.append({
-            'type': 'Feature',
-            'properties': props,
-            'geometry': mapping(simplified)
-        })
+def _tolerances(params: Dict[str, Any]) -> Optional[list]:
+    """params['tolerances'] sorted from finest to coarsest (None when not set)"""
+    tolerances = params.get('tolerances')
+    if tolerances is None:
+        return None
+    if not isinstance(tolerances, list) or not tolerances:
+        raise ValueError("Parameter 'tolerances' must be a non-empty list of numbers")
+    tolerances = sorted({float(t) for t in tolerances})
+    if tolerances[0] < 0:
+        raise ValueError("Parameter 'tolerances' must not contain negative values")
+    return tolerances
 
+
+def _stream_levels(features: Iterable[Dict], tolerances: list, preserve_topology: bool,
+                   metadata: Dict) -> Iterator[Dict]:
+    """
+    Simplify features at every tolerance, one vectorized batch at a time
+
+    Each level is simplified from the previous (finer) one with its full
+    tolerance, so coarser levels work on fewer vertices and keep a subset of
+    the finer level's vertices (nested levels of detail).
+    """
+    total_original = 0
+    level_totals = [0] * len(tolerances)
+    total = len(features) if hasattr(features, '__len__') else None
+    iterator = iter(features)
+    done = 0
+
+    while True:
+        batch = list(islice(iterator, BATCH_SIZE))
+        if not batch:
+            break
+        report(done, total)
+        geoms = geometry_array(batch)
+        original_coords = shapely.get_num_coordinates(geoms)
+        total_original += int(original_coords.sum())
+        original_coords = original_coords.tolist()
+
+        levels = []
+        for level, tolerance in enumerate(tolerances):
+            geoms = shapely.simplify(geoms, tolerance, preserve_topology=preserve_topology)
+            new_coords = shapely.get_num_coordinates(geoms)
+            level_totals[level] += int(new_coords.sum())
+            levels.append((geoms, new_coords.tolist()))
+
+        # Feature by feature, all levels of a feature together - the order
+        # does not depend on the batch (or parallel chunk) size
+        for i, feature in enumerate(batch):
+            for level, (tolerance, (simplified, new_coords)) in enumerate(zip(tolerances, levels)):
+                props = feature.get('properties', {}).copy()
+                props.update({
+                    'lod': level,
+                    'tolerance': tolerance,
+                    'original_vertices': original_coords[i],
+                    'simplified_vertices': new_coords[i]
+                })
+                yield {
+                    'type': 'Feature',
+                    'properties': props,
+                    'geometry': simplified[i]
+                }
+        done += len(batch)
+
+    metadata.update(_levels_metadata(tolerances, total_original, level_totals))
+
+
+def _levels_metadata(tolerances: list, total_original: int, level_totals: list) -> Dict[str, Any]:
     return {
-        'type': 'FeatureCollection',
-        'features': result_features,
-        'metadata': {
+        'tolerances': tolerances,
+        'total_original_vertices': total_original,
+        'levels': [{
+            'lod': level,
             'tolerance': tolerance,
-            'total_original_vertices': total_original,
-            'total_simplified_vertices': total_simplified,
-            'reduction_percent': round((1 - total_simplified / max(total_original, 1)) * 100, 1)
-        }
+            'total_vertices': vertices,
+            'reduction_percent': round((1 - vertices / max(total_original, 1)) * 100, 1)
+        } for level, (tolerance, vertices) in enumerate(zip(tolerances, level_totals))]
     }
 
 
+def merge_metadata(metadata: Dict, chunk: Dict):
+    """Add the vertex totals of a parallel chunk to metadata"""
+    if 'levels' in chunk:
+        total_original = metadata.get('total_original_vertices', 0) + chunk['total_original_vertices']
+        level_totals = [
+            (previous['total_vertices'] if previous else 0) + level['total_vertices']
+            for previous, level in zip(metadata.get('levels') or [None] * len(chunk['levels']), chunk['levels'])
+        ]
+        metadata.update(_levels_metadata(chunk['tolerances'], total_original, level_totals))
+        return
+
+    total_original = metadata.get('total_original_vertices', 0) + chunk['total_original_vertices']
+    total_simplified = metadata.get('total_simplified_vertices', 0) + chunk['total_simplified_vertices']
+    metadata.update({
+        'tolerance': chunk['tolerance'],
+        'total_original_vertices': total_original,
+        'total_simplified_vertices': total_simplified,
+        'reduction_percent': round((1 - total_simplified / max(total_original, 1)) * 100, 1)
+    })
+
+
 def count_coordinates(geom) -> int:
-    """Count total coordinates in a geometry"""
-    try:
-        if hasattr(geom, 'exterior'):
-            # Polygon
-            count = len(geom.exterior.coords)
-            for interior in geom.interiors:
-                count += len(interior.coords)
-            return count
-        elif hasattr(geom, 'coords'):
-            # LineString, LinearRing
-            return len(geom.coords)
-        elif hasattr(geom, 'geoms'):
-            # Multi-geometry
-            return sum(count_coordinates(g) for g in geom.geoms)
-        else:
-            # Point
-            return 1
-    except:
-        return 0
+    """Count total coordinates in a geometry (all parts of multi-geometries and collections)"""
+    return int(shapely.get_num_coordinates(geom))
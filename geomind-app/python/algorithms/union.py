@@ -0,0 +1,223 @@
+"""
+Union engine - Partitioned, parallel cascaded union for dissolve-style operations
+
+union_all(geoms, params) behaves like shapely.ops.unary_union. With params
+{"workers": N} (see parallel.py) and enough geometries, it instead:
+
+1. orders the geometries along a Z-order (Morton) curve of their bounding
+   box centres, on a 65536 x 65536 grid over the total extent, so that
+   neighbours end up in the same partition;
+2. unions each partition in a worker - one partition per worker, more
+   when needed to keep them under MAX_PARTITION_SIZE geometries, which
+   bounds the memory per worker;
+3. merges the partial results MERGE_FANOUT neighbours at a time, in
+   parallel rounds until a single geometry is left.
+
+Merging partial unions dominates the cost when the result is one large
+connected polygon (e.g. a buffered network), so partitions are kept few
+and a merge only overlays the polygons that intersect another partition;
+all other polygons are final already and are passed through as-is.
+
+union_groups() unions many independent groups (e.g. a grouped dissolve):
+small groups are bundled into tasks of about `min_chunk_size` geometries
+and run in parallel, large groups each go through the partitioned union.
+"""
+
+import math
+from concurrent.futures import BrokenExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+from . import parallel
+from .progress import MIN_INTERVAL, report
+
+# Most geometries unioned by one worker task
+MAX_PARTITION_SIZE = 20000
+
+# Partial results combined per merge task
+MERGE_FANOUT = 4
+
+POLYGONAL_TYPES = (3, 6)  # shapely type ids of Polygon, MultiPolygon
+
+
+def union_all(geoms: Sequence[BaseGeometry], params: Optional[Dict[str, Any]] = None,
+              stage: str = 'union') -> BaseGeometry:
+    """
+    Union of geometries (missing geometries are ignored)
+
+    Args:
+        geoms: Shapely geometries
+        params: Algorithm parameters - workers / min_chunk_size select the parallel engine
+        stage: Progress stage name
+
+    Returns:
+        The union, an empty GeometryCollection for no geometries
+    """
+    params = params or {}
+    geoms = np.asarray(geoms, dtype=object)
+    geoms = geoms[~shapely.is_missing(geoms)]
+
+    workers = parallel.worker_count(params)
+    min_size = parallel.min_chunk_size(params)
+    if workers <= 1 or len(geoms) < 2 * min_size:
+        return shapely.union_all(geoms)
+
+    size = min(MAX_PARTITION_SIZE, max(min_size, math.ceil(len(geoms) / workers)))
+    ordered = geoms[np.argsort(_morton_codes(geoms), kind='stable')]
+    partitions = [ordered[i:i + size] for i in range(0, len(ordered), size)]
+
+    executor = parallel.get_executor(workers)
+    tasks = len(partitions) + max(math.ceil((len(partitions) - 1) / (MERGE_FANOUT - 1)), 0)
+    done = 0
+    try:
+        parts = _run_round(executor, _union, partitions, done, tasks, stage)
+        done += len(partitions)
+        while len(parts) > 1:
+            groups = [parts[i:i + MERGE_FANOUT] for i in range(0, len(parts), MERGE_FANOUT)]
+            parts = _run_round(executor, _merge, groups, done, tasks, stage)
+            done += len(groups)
+    except BrokenExecutor:
+        parallel.discard_executor(workers)
+        raise
+    return parts[0]
+
+
+def union_groups(groups: Sequence[Sequence[BaseGeometry]], params: Optional[Dict[str, Any]] = None,
+                 stage: str = 'union') -> List[BaseGeometry]:
+    """
+    Union of each group of geometries, in group order
+
+    Args:
+        groups: Lists of Shapely geometries
+        params: Algorithm parameters - workers / min_chunk_size select parallel execution
+        stage: Progress stage name
+    """
+    params = params or {}
+    groups = [np.asarray(group, dtype=object) for group in groups]
+    workers = parallel.worker_count(params)
+    if workers <= 1:
+        results = []
+        for i, group in enumerate(groups):
+            report(i, len(groups), stage=stage)
+            results.append(union_all(group))
+        return results
+
+    min_size = parallel.min_chunk_size(params)
+    large = [i for i, group in enumerate(groups) if len(group) >= 2 * min_size]
+    large_set = set(large)
+
+    # Bundle the small groups, so each task unions about min_size geometries
+    bundles, bundle, size = [], [], 0
+    for i, group in enumerate(groups):
+        if i in large_set:
+            continue
+        bundle.append(i)
+        size += len(group)
+        if size >= min_size:
+            bundles.append(bundle)
+            bundle, size = [], 0
+    if bundle:
+        bundles.append(bundle)
+
+    executor = parallel.get_executor(workers)
+    results: List[Optional[BaseGeometry]] = [None] * len(groups)
+    futures = {executor.submit(_union_each, [groups[i] for i in indices]): indices for indices in bundles}
+    done = 0
+    try:
+        # The large groups' partitions queue up behind the small bundles
+        for i in large:
+            results[i] = union_all(groups[i], params, stage)
+            done += 1
+
+        pending = set(futures)
+        while pending:
+            report(done + sum(len(futures[f]) for f in futures if f not in pending), len(groups), stage=stage)
+            _, pending = wait(pending, timeout=MIN_INTERVAL)
+        for future, indices in futures.items():
+            for i, geometry in zip(indices, future.result()):
+                results[i] = geometry
+    except BrokenExecutor:
+        parallel.discard_executor(workers)
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+    return results
+
+
+def _run_round(executor, function, groups: List[Sequence[BaseGeometry]], done: int, tasks: int,
+               stage: str) -> List[BaseGeometry]:
+    """Apply function to each group in the executor, results in group order"""
+    futures = [
+        executor.submit(function, group) if len(group) > 1 else None
+        for group in groups
+    ]
+    try:
+        pending = {f for f in futures if f is not None}
+        while pending:
+            report(done + len(groups) - len(pending), tasks, stage=stage)
+            _, pending = wait(pending, timeout=MIN_INTERVAL)
+        return [group[0] if future is None else future.result() for group, future in zip(groups, futures)]
+    finally:
+        for future in futures:
+            if future is not None:
+                future.cancel()
+
+
+def _union(geoms: Sequence[BaseGeometry]) -> BaseGeometry:
+    """Worker side: cascaded union of one group"""
+    return shapely.union_all(np.asarray(geoms, dtype=object))
+
+
+def _union_each(groups: Sequence[Sequence[BaseGeometry]]) -> List[BaseGeometry]:
+    """Worker side: cascaded union of each of a bundle of small groups"""
+    return [shapely.union_all(group) for group in groups]
+
+
+def _merge(parts: Sequence[BaseGeometry]) -> BaseGeometry:
+    """Worker side: union of partial unions, overlaying only the polygons shared between them"""
+    parts = np.asarray(parts, dtype=object)
+    if not np.isin(shapely.get_type_id(parts), POLYGONAL_TYPES).all():
+        return shapely.union_all(parts)
+
+    pieces = [shapely.get_parts(part) for part in parts]
+    source = np.repeat(np.arange(len(parts)), [len(p) for p in pieces])
+    polygons = np.concatenate(pieces)
+    keep = ~shapely.is_empty(polygons)
+    polygons, source = polygons[keep], source[keep]
+    if not len(polygons):
+        return shapely.union_all(parts)
+
+    # Within a partial union polygons are already disjoint - only those
+    # intersecting a polygon of another part need to be overlaid again
+    left, right = shapely.STRtree(polygons).query(polygons, predicate='intersects')
+    shared = np.zeros(len(polygons), dtype=bool)
+    shared[left[source[left] != source[right]]] = True
+
+    merged = shapely.get_parts(shapely.union_all(polygons[shared])) if shared.any() else []
+    result = np.concatenate([polygons[~shared], merged])
+    return result[0] if len(result) == 1 else shapely.multipolygons(result)
+
+
+def _morton_codes(geoms: np.ndarray) -> np.ndarray:
+    """Z-order codes of the bounding box centres, on a 2^16 grid over the total extent"""
+    bounds = shapely.bounds(geoms)
+    centres = np.column_stack(((bounds[:, 0] + bounds[:, 2]) / 2, (bounds[:, 1] + bounds[:, 3]) / 2))
+    valid = ~np.isnan(centres).any(axis=1)
+    low = centres[valid].min(axis=0) if valid.any() else np.zeros(2)
+    centres[~valid] = low  # empty geometries
+    span = np.maximum(centres.max(axis=0) - low, 1e-9)
+    cells = ((centres - low) / span * 65535).astype(np.uint64)
+    return _spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << np.uint64(1))
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """Insert a 0 bit between each of the 16 low bits of v"""
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x33333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x55555555)
+    return v
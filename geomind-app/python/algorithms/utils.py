@@ -0,0 +1,151 @@
+"""
+Shared helpers for the geoprocessing algorithms
+
+Feature geometries may arrive either as GeoJSON dicts or as Shapely
+geometries (binary WKB transport, pipelines). Algorithms put Shapely
+geometries in their output features; qgls_processor serializes them
+to GeoJSON or WKB once, at the very end.
+"""
+
+from collections import defaultdict
+from itertools import chain
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from shapely.geometry.base import BaseGeometry
+
+
+def as_shape(geometry: Any) -> BaseGeometry:
+    """Shapely geometry from a GeoJSON geometry dict (Shapely geometries pass through)"""
+    if isinstance(geometry, BaseGeometry):
+        return geometry
+    return shape(geometry)
+
+
+def geometry_array(features: List[Dict]) -> np.ndarray:
+    """Object array of the Shapely geometries of features (None where missing)"""
+    return geometries_from_geojson([f.get('geometry') for f in features])
+
+
+def geometries_from_geojson(geometries: Sequence[Any], keep_invalid: bool = False) -> np.ndarray:
+    """
+    Shapely geometries from GeoJSON geometry dicts, built in bulk
+
+    Geometries of the simple and multi types are grouped by type and created
+    with one vectorized constructor call per type from their stacked
+    coordinates. Other types - and any group that cannot be built that way,
+    e.g. with empty or mixed-dimension geometries - go through shape() one
+    by one. Shapely geometries pass through and None stays None.
+
+    Args:
+        geometries: GeoJSON geometry dicts, Shapely geometries or None
+        keep_invalid: Leave geometries that fail to convert as given instead of raising
+    """
+    result = np.empty(len(geometries), dtype=object)
+    by_type = defaultdict(list)
+    for i, geometry in enumerate(geometries):
+        if geometry is None or isinstance(geometry, BaseGeometry):
+            result[i] = geometry
+        elif isinstance(geometry, dict) and geometry.get('type') in _BUILDERS:
+            by_type[geometry['type']].append(i)
+        else:
+            by_type[None].append(i)
+
+    for geom_type, indices in by_type.items():
+        if geom_type is not None:
+            try:
+                result[indices] = _BUILDERS[geom_type]([geometries[i]['coordinates'] for i in indices])
+                continue
+            except Exception:
+                pass  # converted one by one below, which reports the culprit
+        for i in indices:
+            try:
+                result[i] = shape(geometries[i])
+            except Exception:
+                if not keep_invalid:
+                    raise
+                result[i] = geometries[i]
+    return result
+
+
+def _stack(parts: List[Any]):
+    """Stacked (n, 2|3) coordinates of coordinate lists and the part index of each coordinate"""
+    coords = np.array(list(chain.from_iterable(parts)), dtype=float)
+    if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+        raise ValueError("Coordinates must all be 2D or all 3D")
+    return coords, np.repeat(np.arange(len(parts)), [len(part) for part in parts])
+
+
+def _points(items: List[Any]) -> np.ndarray:
+    coords = np.array(items, dtype=float)
+    if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+        raise ValueError("Coordinates must all be 2D or all 3D")
+    return shapely.points(coords)
+
+
+def _linestrings(items: List[Any]) -> np.ndarray:
+    coords, index = _stack(items)
+    return shapely.linestrings(coords, indices=index)
+
+
+def _polygons(items: List[Any]) -> np.ndarray:
+    coords, ring_index = _stack(list(chain.from_iterable(items)))
+    rings = shapely.linearrings(coords, indices=ring_index)
+    return shapely.polygons(rings, indices=np.repeat(np.arange(len(items)), [len(rings) for rings in items]))
+
+
+def _multi(build_parts, build_collections):
+    def build(items: List[Any]) -> np.ndarray:
+        parts = build_parts(list(chain.from_iterable(items)))
+        return build_collections(parts, indices=np.repeat(np.arange(len(items)), [len(item) for item in items]))
+    return build
+
+
+# GeoJSON type -> bulk constructor from the list of 'coordinates' members
+_BUILDERS = {
+    'Point': _points,
+    'LineString': _linestrings,
+    'Polygon': _polygons,
+    'MultiPoint': _multi(_points, shapely.multipoints),
+    'MultiLineString': _multi(_linestrings, shapely.multilinestrings),
+    'MultiPolygon': _multi(_polygons, shapely.multipolygons),
+}
+
+
+def snap_features(features: List[Dict], decimals: int) -> List[Dict]:
+    """
+    Snap feature geometries to a 10^-decimals grid
+
+    Coordinates are rounded and vertices that become duplicates are removed
+    (GEOS precision reduction, so polygons stay valid). Returns new feature
+    dicts; the input features are left untouched.
+    """
+    if not features:
+        return features
+
+    snapped = shapely.set_precision(geometry_array(features), 10.0 ** -int(decimals))
+    return [{**feature, 'geometry': geom} for feature, geom in zip(features, snapped)]
+
+
+def shape_collection(collection: Any) -> Any:
+    """
+    FeatureCollection copy with its geometries converted to Shapely once
+
+    Anything that is not a FeatureCollection is returned as-is. Geometries
+    that fail to convert are left as GeoJSON, so each algorithm still
+    reports (or skips) them the way it always did.
+    """
+    if not isinstance(collection, dict) or not isinstance(collection.get('features'), list):
+        return collection
+
+    features = collection['features']
+    geometries = geometries_from_geojson(
+        [feature.get('geometry') if isinstance(feature, dict) else None for feature in features],
+        keep_invalid=True
+    )
+    return {**collection, 'features': [
+        {**feature, 'geometry': geometry} if geometry is not None else feature
+        for feature, geometry in zip(features, geometries)
+    ]}
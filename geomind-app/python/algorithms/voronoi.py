@@ -3,9 +3,13 @@ Voronoi algorithm - Generate Voronoi polygons from points
 """
 
 from typing import Any, Dict, Optional
-from shapely.geometry import shape, mapping, Point, MultiPoint, box
+from shapely.geometry import Point, MultiPoint, box
 from shapely.ops import voronoi_diagram
 import numpy as np
+import shapely
+
+from .progress import report
+from .utils import as_shape
 
 
 def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
@@ -17,7 +21,9 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
         buffer: Buffer around points extent (default: 10% of extent)
 
     Returns:
-        GeoJSON FeatureCollection with Voronoi polygons
+        GeoJSON FeatureCollection with Voronoi polygons, one per input point.
+        Points whose cell could not be found (e.g. outside a given envelope)
+        are listed in metadata 'unmatched_features' (feature id, else index).
     """
     if not input_geojson:
         raise ValueError("Input GeoJSON required for voronoi operation")
@@ -30,20 +36,20 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     # Extract points
     points = []
     point_props = []
+    point_features = []
 
-    for feature in features:
-        geom = shape(feature['geometry'])
+    for index, feature in enumerate(features):
+        geom = as_shape(feature['geometry'])
         if geom.geom_type == 'Point':
-            points.append(geom)
-            point_props.append(feature.get('properties', {}))
+            parts = [geom]
         elif geom.geom_type == 'MultiPoint':
-            for pt in geom.geoms:
-                points.append(pt)
-                point_props.append(feature.get('properties', {}))
+            parts = list(geom.geoms)
         else:
             # Use centroid for non-point geometries
-            points.append(geom.centroid)
-            point_props.append(feature.get('properties', {}))
+            parts = [geom.centroid]
+        points.extend(parts)
+        point_props.extend([feature.get('properties', {})] * len(parts))
+        point_features.extend([feature.get('id', index)] * len(parts))
 
     if len(points) < 3:
         raise ValueError("At least 3 points required for Voronoi diagram")
@@ -71,30 +77,43 @@ def run(input_geojson: Optional[Dict], params: Dict[str, Any]) -> Dict:
     # Generate Voronoi diagram
     voronoi = voronoi_diagram(multipoint, envelope=env_geom)
 
-    # Match polygons to original points
+    # Match polygons to original points - one bulk STRtree query
+    report(0, len(points), stage='match')
+    voronoi_polys = np.asarray(voronoi.geoms)
+    point_array = np.asarray(points)
+    point_index, poly_index = shapely.STRtree(voronoi_polys).query(point_array, predicate='within')
+
+    # A point lies within a single cell; keep the first match if rounding ever gives two
+    cell = np.full(len(points), -1)
+    cell[point_index[::-1]] = poly_index[::-1]
+    areas = shapely.area(voronoi_polys)
+    xs = shapely.get_x(point_array).tolist()
+    ys = shapely.get_y(point_array).tolist()
+
     result_features = []
-    voronoi_polys = list(voronoi.geoms)
-
-    for i, point in enumerate(points):
-        # Find the Voronoi polygon containing this point
-        for poly in voronoi_polys:
-            if poly.contains(point):
-                props = point_props[i].copy() if i < len(point_props) else {}
-                props['voronoi_area'] = round(poly.area, 2)
-                props['source_point'] = [point.x, point.y]
-
-                result_features.append({
-                    'type': 'Feature',
-                    'properties': props,
-                    'geometry': mapping(poly)
-                })
-                break
+    for i in np.flatnonzero(cell >= 0).tolist():
+        poly = cell[i]
+        props = point_props[i].copy()
+        props['voronoi_area'] = round(float(areas[poly]), 2)
+        props['source_point'] = [xs[i], ys[i]]
+
+        result_features.append({
+            'type': 'Feature',
+            'properties': props,
+            'geometry': voronoi_polys[poly]
+        })
+
+    metadata = {
+        'input_points': len(points),
+        'output_polygons': len(result_features)
+    }
+    unmatched = np.flatnonzero(cell < 0).tolist()
+    if unmatched:
+        metadata['unmatched_points'] = len(unmatched)
+        metadata['unmatched_features'] = list(dict.fromkeys(point_features[i] for i in unmatched))
 
     return {
         'type': 'FeatureCollection',
         'features': result_features,
-        'metadata': {
-            'input_points': len(points),
-            'output_polygons': len(result_features)
-        }
+        'metadata': metadata
     }
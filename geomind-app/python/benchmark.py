@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Throughput, latency and memory of the geoprocessing algorithms
+
+Generates synthetic MN95 (EPSG:2056) datasets and runs every registered
+algorithm through qgls_processor.process(), then serialize_result() - i.e.
+what a bridge request costs once the input is parsed.
+
+Datasets (deterministic for a given size):
+    chambers    points (manholes)
+    collectors  7-vertex lines (sewer/water pipes)
+    parcels     jittered quadrilateral tiling (shared edges, like a cadastre)
+
+Usage:
+    python benchmark.py [--sizes 1000,10000,100000,1000000] [--repeat 5]
+                        [--algorithms buffer,dissolve] [--max-seconds 60]
+                        [--output results.json]
+                        [--save-baseline [PATH]] [--baseline [PATH]] [--threshold 0.25]
+                        [--cold-start-limit MS] [--cold-start]
+
+Results are printed (or written to --output) as JSON. --save-baseline stores
+them as the reference run (default: benchmark_baseline.json next to this
+script); --baseline compares against it and exits with 1 when a case got
+slower than the threshold (p50 latency, 0.25 = 25%).
+
+Every run also times a one-shot CLI call (cold start) and exits with 1 when
+`import qgls_processor` or a '__list__' request loads an algorithm module
+(or NumPy / Shapely), or when it took longer than --cold-start-limit
+milliseconds. --cold-start runs only that check.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import qgls_processor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, 'benchmark_baseline.json')
+
+SIZES = (1000, 10000, 100000, 1000000)
+DEFAULT_SIZES = (1000, 10000)
+
+# South-west corner of the generated area (Bussigny, MN95)
+ORIGIN = (2532000.0, 1156000.0)
+
+MATERIALS = ('PVC', 'PE', 'Beton', 'Fonte', 'Gres')
+COMMUNES = ('Bussigny', 'Crissier', 'Ecublens', 'Renens', 'Villars-Ste-Croix')
+
+# algorithm -> [(dataset, params)]
+CASES = {
+    'buffer': [
+        ('chambers', {'distance': 1.5}),
+        ('collectors', {'distance': 2, 'cap_style': 'flat'}),
+        ('parcels', {'distance': 2}),
+    ],
+    'dissolve': [
+        ('parcels', {}),
+        ('parcels', {'field': 'commune'}),
+    ],
+    'simplify': [
+        ('collectors', {'tolerance': 1}),
+        ('parcels', {'tolerance': 0.5}),
+    ],
+    'voronoi': [
+        ('chambers', {}),
+    ],
+    'delaunay': [
+        ('chambers', {'field': 'z_couvercle'}),
+        ('chambers', {'field': 'z_couvercle', 'output': 'raster', 'cell_size': 5}),
+    ],
+    'tin': [
+        # Polygons are triangulated through their centroids
+        ('parcels', {'field': 'numero', 'max_edge_length': 60}),
+    ],
+    'convex_hull': [
+        ('chambers', {}),
+        ('chambers', {'group_by': 'type'}),
+        ('chambers', {'hull_type': 'concave', 'ratio': 0.1}),
+    ],
+    'centroid': [
+        ('parcels', {}),
+    ],
+    'grid': [
+        ('parcels', {'cell_size': 100}),
+    ],
+}
+
+# Modules `import qgls_processor` must not load: algorithms and their
+# dependencies are imported by the first request that needs them
+LAZY_MODULES = ('algorithms', 'numpy', 'shapely')
+
+# ... except these lightweight ones (job progress tracking), which every request imports
+REQUEST_MODULES = ('algorithms', 'algorithms.progress')
+
+# Request that must not load LAZY_MODULES either (the bridge's algorithm listing)
+LIST_REQUEST = {'id': 1, 'algorithm': '__list__', 'params': {}, 'input': None}
+
+# Algorithms that need more than generated vectors
+SKIPPED = {
+    'clip_raster': 'needs a raster file and rasterio',
+}
+
+
+# -- synthetic data ------------------------------------------------------------
+
+def _side(size: int) -> int:
+    return max(1, math.ceil(math.sqrt(size)))
+
+
+def make_chambers(size: int, seed: int = 1) -> Dict[str, Any]:
+    """Manhole points, spaced ~25 m apart"""
+    rng = random.Random(seed)
+    side = _side(size) * 25.0
+    features = []
+    for i in range(size):
+        x = ORIGIN[0] + rng.random() * side
+        y = ORIGIN[1] + rng.random() * side
+        features.append({
+            'type': 'Feature',
+            'id': i,
+            'properties': {
+                'numero': f'CH{i:07d}',
+                'type': ('EU', 'EC', 'UN')[i % 3],
+                'z_couvercle': round(400 + rng.random() * 50, 2)
+            },
+            'geometry': {'type': 'Point', 'coordinates': [round(x, 3), round(y, 3)]}
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def make_collectors(size: int, seed: int = 2) -> Dict[str, Any]:
+    """Pipe lines of 6 segments, 5-20 m each"""
+    rng = random.Random(seed)
+    side = _side(size) * 25.0
+    features = []
+    for i in range(size):
+        x = ORIGIN[0] + rng.random() * side
+        y = ORIGIN[1] + rng.random() * side
+        heading = rng.random() * 2 * math.pi
+        coords = [[round(x, 3), round(y, 3)]]
+        for _ in range(6):
+            heading += rng.uniform(-0.5, 0.5)
+            length = rng.uniform(5, 20)
+            x += math.cos(heading) * length
+            y += math.sin(heading) * length
+            coords.append([round(x, 3), round(y, 3)])
+        features.append({
+            'type': 'Feature',
+            'id': i,
+            'properties': {
+                'materiau': MATERIALS[i % len(MATERIALS)],
+                'diametre': (150, 200, 250, 300, 400)[i % 5],
+                'annee': 1950 + i % 70
+            },
+            'geometry': {'type': 'LineString', 'coordinates': coords}
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def make_parcels(size: int, seed: int = 3) -> Dict[str, Any]:
+    """Cadastral tiling: 30 m cells whose inner corners are jittered (shared edges stay exact)"""
+    rng = random.Random(seed)
+    side = _side(size)
+    cell = 30.0
+
+    def corner(i, j):
+        inner = 0 < i < side and 0 < j < side
+        dx, dy = (rng.uniform(-8, 8), rng.uniform(-8, 8)) if inner else (0.0, 0.0)
+        return [round(ORIGIN[0] + i * cell + dx, 3), round(ORIGIN[1] + j * cell + dy, 3)]
+
+    corners = [[corner(i, j) for j in range(side + 1)] for i in range(side + 1)]
+    features = []
+    for n in range(size):
+        i, j = divmod(n, side)
+        ring = [corners[i][j], corners[i + 1][j], corners[i + 1][j + 1], corners[i][j + 1], corners[i][j]]
+        features.append({
+            'type': 'Feature',
+            'id': n,
+            'properties': {
+                'numero': n + 1,
+                'commune': COMMUNES[i * len(COMMUNES) // side],
+                'genre': ('privé', 'public', 'DP')[n % 3]
+            },
+            'geometry': {'type': 'Polygon', 'coordinates': [ring]}
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+DATASETS = {
+    'chambers': make_chambers,
+    'collectors': make_collectors,
+    'parcels': make_parcels,
+}
+
+
+# -- measurement -----------------------------------------------------------------
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_once(algorithm: str, params: Dict[str, Any], collection: Dict[str, Any]) -> Dict[str, Any]:
+    """One request: process() + serialize_result(), returns its metrics and latency"""
+    start = time.perf_counter()
+    result = qgls_processor.process(algorithm, params, collection)
+    qgls_processor.serialize_result(result)
+    elapsed = time.perf_counter() - start
+    if not result['success']:
+        raise RuntimeError(result['error'])
+    return {'ms': elapsed * 1000, 'metrics': result['metrics']}
+
+
+def bench_case(algorithm: str, dataset: str, params: Dict[str, Any], collection: Dict[str, Any],
+               repeat: int, max_seconds: float) -> Dict[str, Any]:
+    """
+    Benchmark one (algorithm, dataset, params) case
+
+    The first run is reported separately (first_ms, includes the module import),
+    then up to `repeat` runs are measured - fewer when they exceed max_seconds.
+    """
+    size = len(collection['features'])
+    entry = {'algorithm': algorithm, 'dataset': dataset, 'size': size, 'params': params}
+
+    try:
+        first = run_once(algorithm, params, collection)
+        runs = []
+        budget_start = time.perf_counter()
+        while len(runs) < repeat:
+            runs.append(run_once(algorithm, params, collection))
+            if time.perf_counter() - budget_start > max_seconds:
+                break
+    except Exception as e:
+        entry['error'] = str(e)
+        return entry
+
+    latencies = [run['ms'] for run in runs]
+    p50 = percentile(latencies, 50)
+    phases = {
+        name: round(percentile([run['metrics'][f'{name}_ms'] for run in runs], 50), 2)
+        for name in ('to_geometry', 'compute', 'to_geojson', 'serialize')
+    }
+    peaks = [run['metrics'].get('peak_rss_mb') for run in [first] + runs]
+    peaks = [peak for peak in peaks if peak is not None]
+
+    entry.update({
+        'runs': len(runs),
+        'first_ms': round(first['ms'], 2),
+        'p50_ms': round(p50, 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'features_per_s': round(size / (p50 / 1000)) if p50 else None,
+        'phases_p50_ms': phases,
+        'output_features': runs[-1]['metrics'].get('output_features'),
+        'peak_rss_mb': max(peaks) if peaks else None
+    })
+    return entry
+
+
+def cold_start(runs: int = 3, limit_ms: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Wall time of a one-shot CLI call (process start + centroid of one point)
+
+    'regression' is set when `import qgls_processor` or a '__list__'
+    request loads LAZY_MODULES, or when the p50 time is above limit_ms.
+    """
+    script = os.path.join(SCRIPT_DIR, 'qgls_processor.py')
+    point = json.dumps({'type': 'Point', 'coordinates': [ORIGIN[0], ORIGIN[1]]})
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script, 'centroid', '{}'], input=point,
+                       capture_output=True, text=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+
+    p50 = round(percentile(times, 50), 2)
+    eager = startup_modules()
+    listing = startup_modules(LIST_REQUEST)
+    return {
+        'algorithm': 'centroid',
+        'runs': runs,
+        'p50_ms': p50,
+        'limit_ms': limit_ms,
+        'eager_modules': eager,
+        'list_modules': listing,
+        'regression': bool(eager or listing) or (limit_ms is not None and p50 > limit_ms)
+    }
+
+
+def startup_modules(request: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    LAZY_MODULES (and submodules) loaded by `import qgls_processor` in a
+    fresh interpreter - then by handling request, when given
+    """
+    code = (
+        'import json, sys, qgls_processor; '
+        + (f'qgls_processor.handle_request({json.dumps(request)!r}); ' if request else '')
+        + f'print(json.dumps(sorted(m for m in sys.modules if m.split(".")[0] in {LAZY_MODULES!r} '
+        f'and m not in {REQUEST_MODULES!r})))'
+    )
+    process = subprocess.run([sys.executable, '-c', code], cwd=SCRIPT_DIR,
+                             capture_output=True, text=True, check=True)
+    return json.loads(process.stdout)
+
+
+def case_key(entry: Dict[str, Any]) -> str:
+    return f"{entry['algorithm']}|{entry['dataset']}|{entry['size']}|{json.dumps(entry['params'], sort_keys=True)}"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    """p50 latency of each case against the baseline run"""
+    reference = {case_key(entry): entry for entry in baseline.get('results', []) if 'p50_ms' in entry}
+    cases = []
+    for entry in results['results']:
+        base = reference.get(case_key(entry))
+        if base is None or 'p50_ms' not in entry or not base['p50_ms']:
+            continue
+        ratio = entry['p50_ms'] / base['p50_ms']
+        cases.append({
+            'case': case_key(entry),
+            'baseline_p50_ms': base['p50_ms'],
+            'p50_ms': entry['p50_ms'],
+            'ratio': round(ratio, 3),
+            'regression': ratio > 1 + threshold
+        })
+    return {
+        'baseline': baseline.get('generated'),
+        'threshold': threshold,
+        'regressions': sum(case['regression'] for case in cases),
+        'cases': cases
+    }
+
+
+def run_benchmark(sizes, algorithms: Optional[List[str]] = None, repeat: int = 5,
+                  max_seconds: float = 60, log=None, cold_start_limit: Optional[float] = None) -> Dict[str, Any]:
+    """Run the benchmark cases of the selected algorithms at each size"""
+    import shapely
+
+    algorithms = algorithms or list(qgls_processor.ALGORITHMS)
+    results = []
+    skipped = []
+    for algorithm in algorithms:
+        if algorithm not in CASES:
+            skipped.append({'algorithm': algorithm, 'reason': SKIPPED.get(algorithm, 'no benchmark case')})
+
+    for size in sizes:
+        collections = {}
+        for algorithm in algorithms:
+            for dataset, params in CASES.get(algorithm, []):
+                if dataset not in collections:
+                    collections[dataset] = DATASETS[dataset](size)
+                if log:
+                    log(f'{algorithm} {dataset} {size} {json.dumps(params)}')
+                results.append(bench_case(algorithm, dataset, params, collections[dataset], repeat, max_seconds))
+
+    return {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'shapely': shapely.__version__,
+            'geos': shapely.geos_version_string,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count()
+        },
+        'repeat': repeat,
+        'cold_start': cold_start(limit_ms=cold_start_limit),
+        'results': results,
+        'skipped': skipped
+    }
+
+
+def comma_list(value: str) -> List[str]:
+    """argparse type for comma-separated values"""
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def size_list(value: str) -> List[int]:
+    """argparse type for comma-separated dataset sizes"""
+    try:
+        return [int(v) for v in comma_list(value)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size list: '{value}'") from None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line; unknown or abbreviated options are rejected"""
+    parser = argparse.ArgumentParser(
+        description='Throughput, latency and memory of the geoprocessing algorithms',
+        allow_abbrev=False)
+    parser.add_argument('--sizes', type=size_list, default=list(DEFAULT_SIZES),
+                        help='comma-separated feature counts (default: 1000,10000)')
+    parser.add_argument('--algorithms', type=comma_list, default=None,
+                        help='comma-separated algorithms (default: all)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=60)
+    parser.add_argument('--output', metavar='PATH', help='write the JSON results to PATH')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help='store the results as the reference run')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help='compare against a reference run')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--cold-start-limit', type=float, metavar='MS')
+    parser.add_argument('--cold-start', action='store_true', help='only run the cold start check')
+
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point - CLI interface"""
+    args = parse_args()
+
+    unknown = [a for a in args.algorithms or [] if a not in qgls_processor.ALGORITHMS]
+    if unknown:
+        print(json.dumps({'success': False, 'error': f"Unknown algorithm: {', '.join(unknown)}",
+                          'available': list(qgls_processor.ALGORITHMS)}))
+        sys.exit(1)
+
+    limit = args.cold_start_limit
+    if args.cold_start:
+        results = {'cold_start': cold_start(limit_ms=limit)}
+        print(json.dumps(results, indent=2))
+        sys.exit(1 if results['cold_start']['regression'] else 0)
+
+    results = run_benchmark(
+        args.sizes,
+        args.algorithms,
+        repeat=args.repeat,
+        max_seconds=args.max_seconds,
+        log=lambda message: print(message, file=sys.stderr),
+        cold_start_limit=limit
+    )
+
+    regressions = int(results['cold_start']['regression'])
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            results['comparison'] = compare(results, json.load(f), args.threshold)
+        regressions += results['comparison']['regressions']
+
+    text = json.dumps(results, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+"""
+GeoJSON Stream - Incremental reader for large FeatureCollections
+
+Reads a GeoJSON document from a text stream in chunks and yields the
+members of its 'features' array one at a time, so the whole collection
+is never held in memory (neither as text nor as parsed dicts).
+"""
+
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+CHUNK_SIZE = 1 << 20  # 1 MB
+WHITESPACE = ' \t\n\r\ufeff'
+
+
+def json_default(value: Any) -> Any:
+    """JSON fallback for geometry objects (Shapely) left in algorithm results"""
+    if hasattr(value, '__geo_interface__'):
+        return value.__geo_interface__
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(value: Any) -> str:
+    """Serialize a result to JSON, converting geometries to GeoJSON on the fly"""
+    return json.dumps(value, default=json_default)
+
+
+def geometry_texts(data: Any) -> Optional[List[Optional[str]]]:
+    """
+    GeoJSON text of each Shapely feature geometry of a result FeatureCollection
+
+    Converted with one vectorized shapely.to_geojson call. None (for the
+    whole collection, or for one feature) where dumps() has to be used -
+    no Shapely geometry, or a LinearRing / empty geometry, whose Shapely
+    GeoJSON text differs from __geo_interface__.
+    """
+    if not isinstance(data, dict) or not data.get('features') or not isinstance(data['features'], list):
+        return None
+
+    import numpy as np
+    import shapely
+    from shapely.geometry.base import BaseGeometry
+
+    array = np.array([
+        feature['geometry']
+        if isinstance(feature, dict) and isinstance(feature.get('geometry'), BaseGeometry) else None
+        for feature in data['features']
+    ], dtype=object)
+    bulk = (shapely.get_type_id(array) != 2) & ~shapely.is_empty(array) & ~shapely.is_missing(array)
+    if not bulk.any():
+        return None
+    texts = np.full(len(array), None, dtype=object)
+    texts[bulk] = shapely.to_geojson(array[bulk])
+    return texts.tolist()
+
+
+def dumps_collection(data: Dict, texts: List[Optional[str]]) -> str:
+    """dumps() of a FeatureCollection, splicing in pre-converted geometry texts (see geometry_texts)"""
+    features = []
+    for feature, text in zip(data['features'], texts):
+        if text is None:
+            features.append(dumps(feature))
+        else:
+            features.append(_splice(dumps({k: v for k, v in feature.items() if k != 'geometry'}), 'geometry', text))
+    return _splice(dumps({k: v for k, v in data.items() if k != 'features'}), 'features', f"[{', '.join(features)}]")
+
+
+def _splice(text: str, key: str, value: str) -> str:
+    """Add a member with pre-serialized JSON value to the serialized object text"""
+    separator = '' if text == '{}' else ', '
+    return f'{text[:-1]}{separator}"{key}": {value}}}'
+
+
+class SerializedData(dict):
+    """
+    Result data that also carries its JSON text
+
+    A result stored in the cache has to be serialized anyway; keeping the
+    text lets the response reuse it instead of encoding the data again.
+    """
+
+    def __init__(self, data: Dict, text: str):
+        super().__init__(data)
+        self.text = text
+
+
+class FeatureReader:
+    """
+    Incremental FeatureCollection reader
+
+    Usage:
+        reader = FeatureReader(sys.stdin)
+        if reader.streaming:
+            for feature in reader:
+                ...
+            reader.members   # other top-level members ('type', 'crs', ...)
+        else:
+            reader.document  # not a FeatureCollection, fully parsed (or None)
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.members: Dict[str, Any] = {}
+        self.document: Optional[Any] = None
+        self.streaming = False
+
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._consumed = False
+
+        self._open()
+
+    # -- buffer handling -------------------------------------------------
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Read more text, returns False at end of stream"""
+        if self._eof:
+            return False
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop consumed text before growing the buffer
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            found = repr(char) if char else 'end of input'
+            raise json.JSONDecodeError(f"Expected {' or '.join(map(repr, chars))}, found {found}",
+                                       self._buf, self._pos)
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        """Decode the next JSON value, reading more text until it is complete"""
+        self._peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number at the very end of the buffer may still be truncated
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Grow reads geometrically so huge values are not re-decoded too often
+            self._fill(read_size)
+            read_size *= 2
+
+    # -- document structure ------------------------------------------------
+
+    def _open(self):
+        """Parse top-level members up to the start of the 'features' array"""
+        char = self._peek()
+        if not char:
+            return
+        if char != '{':
+            self.document = self._value()
+            return
+
+        self._pos += 1
+        if self._read_members(stop_at='features'):
+            self._expect('[')
+            self.streaming = True
+        else:
+            self.document = self.members
+
+    def _read_members(self, stop_at: Optional[str] = None) -> bool:
+        """
+        Read 'key: value' members into self.members until the closing brace
+
+        Returns True when stopped right before the value of member `stop_at`
+        """
+        if self._peek() == '}':
+            self._pos += 1
+            return False
+
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key == stop_at:
+                return True
+            self.members[key] = self._value()
+            if self._expect(',}') == '}':
+                return False
+
+    def __iter__(self) -> Iterator[Dict]:
+        if not self.streaming or self._consumed:
+            return
+        self._consumed = True
+
+        if self._peek() == ']':
+            self._pos += 1
+        else:
+            while True:
+                yield self._value()
+                if self._expect(',]') == ']':
+                    break
+
+        # Members after the features array
+        if self._expect(',}') == ',':
+            self._read_members()
+
+
+class SequenceWriter:
+    """
+    GeoJSON text sequence writer
+
+    Writes one JSON text per line, as soon as it is produced. With
+    record_separator=True the output is RFC 8142 GeoJSONSeq (each text is
+    prefixed with the ASCII RS character), otherwise plain NDJSON.
+
+    A pipe (stdout) is block-buffered, so with flush=True the stream is
+    flushed every FLUSH_FEATURES features or FLUSH_SECONDS, whichever comes
+    first, and after every other record (status, errors).
+    """
+
+    RS = '\x1e'
+    FLUSH_FEATURES = 1000
+    FLUSH_SECONDS = 0.5
+
+    def __init__(self, stream: TextIO, record_separator: bool = True, flush: bool = False):
+        self.stream = stream
+        self.prefix = self.RS if record_separator else ''
+        self.auto_flush = flush
+        self.count = 0
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def write(self, value: Any):
+        self.stream.write(self.prefix + dumps(value) + '\n')
+        if self.auto_flush:
+            self._flush()
+
+    def write_feature(self, feature: Dict):
+        self.stream.write(self.prefix + dumps(feature) + '\n')
+        self.count += 1
+        if self.auto_flush:
+            self._unflushed += 1
+            if self._unflushed >= self.FLUSH_FEATURES or time.monotonic() - self._flushed_at >= self.FLUSH_SECONDS:
+                self._flush()
+
+    def _flush(self):
+        self.stream.flush()
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
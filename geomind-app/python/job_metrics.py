@@ -0,0 +1,124 @@
+"""
+Job Metrics - Per-request timings and memory figures
+
+Every processor response carries a 'metrics' block:
+
+    parse_ms          request / input text -> Python objects
+    to_geometry_ms    GeoJSON geometries -> Shapely
+    compute_ms        algorithm run (streamed runs: everything, input included)
+    to_geojson_ms     Shapely geometries -> GeoJSON
+    serialize_ms      result -> JSON text
+    import_ms         algorithm module import paid by this request
+    input_features    / output_features
+    peak_rss_mb       peak resident memory (per request on Linux, process
+                      lifetime elsewhere)
+    traced_peak_mb    Python heap peak, with params {"trace_memory": true}
+                      (tracemalloc - slower, and blind to GEOS allocations)
+    profile           cProfile stats file, with params {"profile": "<path>"}
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+PHASES = ('parse', 'to_geometry', 'compute', 'to_geojson', 'serialize')
+
+
+def reset_peak_rss():
+    """Restart peak RSS tracking for the current process (Linux only, best effort)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident memory of the current process in MB
+
+    Reads VmHWM on Linux (reset by reset_peak_rss), otherwise the
+    lifetime maximum from resource or psutil. None when unavailable.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, KB elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process(os.getpid()).memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class JobMetrics:
+    """
+    Collects the metrics of one request
+
+    Usage:
+        metrics = JobMetrics()
+        with metrics.phase('parse'):
+            ...
+        metrics.set('input_features', n)
+        response['metrics'] = metrics.to_dict()
+
+    The phases after compute (to_geojson, serialize) are added to the
+    finished block by the serializing code, see qgls_processor.serialize_result.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.values: Dict[str, Any] = {}
+        self._tracing = False
+        reset_peak_rss()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block, adding to the phase total (phases may repeat)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def set(self, key: str, value: Any):
+        self.values[key] = value
+
+    def trace_memory(self, enabled: bool):
+        """Measure the Python heap peak with tracemalloc from here on"""
+        if enabled and not self._tracing and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metrics block for a response (stops tracemalloc if it was started here)"""
+        metrics = {f'{name}_ms': round(self.seconds.get(name, 0.0) * 1000, 2) for name in PHASES}
+        metrics.update(self.values)
+
+        peak = peak_rss_mb()
+        if peak is not None:
+            metrics['peak_rss_mb'] = round(peak, 1)
+        if self._tracing:
+            metrics['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            tracemalloc.stop()
+            self._tracing = False
+        return metrics
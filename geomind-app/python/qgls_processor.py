@@ -5,42 +5,304 @@ Communicates with Node.js via stdin/stdout using JSON
 
 Usage:
     python qgls_processor.py <algorithm> <params_json>
+    python qgls_processor.py --serve
+    python qgls_processor.py --serve --pool [--workers N] [--timeout S] [--max-memory MB]
+    python qgls_processor.py --serve [--cache] [--cache-dir DIR] [--cache-ttl S]
 
 Input: GeoJSON via stdin
 Output: GeoJSON via stdout
+
+Per-feature algorithms (buffer, simplify, centroid) read a FeatureCollection
+from stdin incrementally, one feature at a time, instead of loading it whole.
+
+With params {"output_format": "geojsonseq"} (RFC 8142) or "ndjson", the CLI
+writes one feature per line as soon as it is produced, followed by a final
+status record {"success": ..., "feature_count": ..., "metadata": ...}.
+
+With params {"input_format": "wkb"} / {"output_format": "wkb"} the CLI reads /
+writes binary QWKB payloads instead (see wkb_transport.py).
+
+The pseudo-algorithm "pipeline" chains steps in-process, e.g.
+    {"steps": [{"algorithm": "buffer", "params": {"distance": 5}},
+               {"algorithm": "dissolve"},
+               {"algorithm": "simplify", "params": {"tolerance": 0.5}}]}
+Intermediate results stay as Shapely geometries; only the last is serialized.
+
+params {"output_precision": 3} snaps every output coordinate to 3 decimals
+(millimetres in EPSG:2056) and drops vertices that become duplicates.
+
+Results can be cached by content (see result_cache.py): enable with --cache /
+--cache-dir in serve mode or QGLS_CACHE / QGLS_CACHE_DIR, bypass per request
+with params {"cache": false}.
+
+Big inputs / outputs can stay on disk: params {"input_file": path} reads the
+features from a GeoJSON, GeoJSONSeq, GeoPackage or FlatGeobuf file instead of
+stdin, {"output_file": path} writes them there and only returns the path,
+feature count and metadata (see vector_files.py).
+
+Every response carries a 'metrics' block: time per phase (parse, to_geometry,
+compute, to_geojson, serialize), input/output feature counts and peak RSS
+(see job_metrics.py). params {"profile": "<path>"} also dumps cProfile stats
+of the run, {"trace_memory": true} adds the tracemalloc heap peak.
+
+In --serve mode the process stays alive and reads one JSON request per line
+on stdin: {"id": ..., "algorithm": ..., "params": {...}, "input": {...}}.
+Each request gets exactly one response line on stdout (the usual result
+dictionary, with the request 'id' echoed back). With --pool, requests are
+dispatched to N worker processes (default: CPU count) and responses may
+arrive out of order; a request may carry its own 'timeout' in seconds
+(counted from submission), as its first member or right after 'id'.
+
+Long jobs report progress with params {"progress": true}: JSON lines
+{"type": "progress", "id": ..., "processed": ..., "fraction": ...} on stderr.
+In --serve mode a line {"cancel": <id>} cancels a queued or running request.
 """
 
+import os
 import sys
 import json
+import importlib
+import queue
+import threading
+import time
 import traceback
-from typing import Any, Dict, Optional
-
-# Import algorithms
-from algorithms import (
-    buffer,
-    dissolve,
-    simplify,
-    voronoi,
-    convex_hull,
-    centroid,
-    grid,
-    clip_raster
-)
-
-# Algorithm registry
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from geojson_stream import FeatureReader, SequenceWriter, SerializedData, dumps, dumps_collection, geometry_texts
+from job_metrics import JobMetrics, peak_rss_mb
+
+# Algorithm registry - name -> module, imported on first use so a call only
+# pays for the modules (and dependencies) it actually needs
 ALGORITHMS = {
-    'buffer': buffer.run,
-    'dissolve': dissolve.run,
-    'simplify': simplify.run,
-    'voronoi': voronoi.run,
-    'convex_hull': convex_hull.run,
-    'centroid': centroid.run,
-    'grid': grid.run,
-    'clip_raster': clip_raster.run,
+    'buffer': 'algorithms.buffer',
+    'dissolve': 'algorithms.dissolve',
+    'simplify': 'algorithms.simplify',
+    'voronoi': 'algorithms.voronoi',
+    'delaunay': 'algorithms.delaunay',
+    'tin': 'algorithms.delaunay',
+    'convex_hull': 'algorithms.convex_hull',
+    'centroid': 'algorithms.centroid',
+    'grid': 'algorithms.grid',
+    'clip_raster': 'algorithms.clip_raster',
+}
+
+# Pseudo-algorithm running an ordered list of steps in-process
+PIPELINE = 'pipeline'
+
+# Algorithms with side effects (files written) are never cached
+UNCACHEABLE_ALGORITHMS = {'clip_raster'}
+
+# Result cache, set up by configure_cache() (None = disabled)
+RESULT_CACHE = None
+
+# Result members stored in the cache (a pipeline's per-step summary too)
+CACHED_MEMBERS = ('data', 'steps')
+
+# Per-feature algorithms that can consume features as they are read
+STREAMING_ALGORITHMS = {'buffer', 'simplify', 'centroid'}
+
+# Seconds spent importing each loaded algorithm module
+IMPORT_TIMES: Dict[str, float] = {}
+
+# Import times not yet reported in a response
+_unreported_imports: Dict[str, float] = {}
+
+# Line-oriented output formats: name -> RFC 8142 record separator
+SEQUENCE_FORMATS = {
+    'geojsonseq': True,
+    'ndjson': False,
 }
 
 
-def process(algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict] = None) -> Dict[str, Any]:
+def process(algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict] = None,
+            metrics: Optional[JobMetrics] = None, cache_input: Any = None) -> Dict[str, Any]:
+    """
+    Execute a geoprocessing algorithm, through the result cache when enabled
+
+    Args:
+        algorithm: Algorithm name
+        params: Algorithm parameters
+        input_geojson: Input GeoJSON (optional, some algorithms don't need input)
+        metrics: Metrics of the request so far (e.g. with its parse time)
+        cache_input: Identity of the input in the cache key (default: input_geojson)
+
+    Returns:
+        Result dictionary with 'success', 'data' or 'error' keys and a
+        'metrics' block (plus 'cache' hit/miss counters when the cache is enabled)
+    """
+    metrics = metrics or JobMetrics()
+    if params.get('input_file') or params.get('output_file'):
+        return process_files(algorithm, params, input_geojson, metrics)
+
+    metrics.trace_memory(params.get('trace_memory'))
+    metrics.set('input_features', feature_count(input_geojson))
+    metrics.set('import_ms', 0.0)
+
+    cache = RESULT_CACHE
+    if cache is None or not is_cacheable(algorithm, params):
+        result = execute_measured(algorithm, params, input_geojson, metrics)
+    else:
+        key = cache.key(algorithm, params, input_geojson if cache_input is None else cache_input)
+        entry = cache.get(key)
+        if entry is not None:
+            result = {
+                'success': True,
+                **entry,
+                'cache': cache.info(hit=True)
+            }
+        else:
+            result = execute_measured(algorithm, params, input_geojson, metrics)
+            if result['success'] and isinstance(result['data'], dict):
+                # Serialized once here, the response reuses the text
+                result['data'] = serialize_data(result['data'], metrics)
+                cache.put(key, {k: result[k] for k in CACHED_MEMBERS if k in result}, result['data'].text)
+            result['cache'] = cache.info(hit=False)
+
+    if result['success']:
+        metrics.set('output_features', feature_count(result['data']))
+    result['metrics'] = {**metrics.to_dict(), **(result.get('metrics') or {})}
+    return result
+
+
+def process_files(algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict],
+                  metrics: JobMetrics) -> Dict[str, Any]:
+    """
+    Execute an algorithm reading params['input_file'] and / or writing params['output_file']
+
+    Per-feature algorithms stream from the input file (and into the output
+    file) unless the call is cached; the cache key of an input file is its
+    path, size and modification time. With an output file the result only
+    carries 'output_file', 'feature_count' and 'metadata'.
+    """
+    import vector_files
+
+    inner = {k: v for k, v in params.items() if k not in vector_files.FILE_PARAMS}
+    input_path = params.get('input_file')
+    output_path = params.get('output_file')
+    layer = params.get('input_layer')
+
+    features = None
+    cache_input = None
+    if input_path:
+        try:
+            if can_stream(algorithm, inner) and not (RESULT_CACHE and is_cacheable(algorithm, inner)):
+                features = vector_files.read_features(input_path, layer)
+            else:
+                with metrics.phase('parse'):
+                    stat = os.stat(input_path)
+                    cache_input = {'input_file': os.path.abspath(input_path), 'layer': layer,
+                                   'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+                    input_geojson = vector_files.read_collection(input_path, layer)
+        except (OSError, ValueError) as e:
+            return {'success': False, 'error': f'Invalid input file: {e}', 'metrics': metrics.to_dict()}
+
+    writer = None
+    if output_path:
+        try:
+            writer = vector_files.open_writer(output_path, params.get('output_layer'), params.get('output_srs_id'))
+        except (OSError, ValueError) as e:
+            return {'success': False, 'error': f'Invalid output file: {e}', 'metrics': metrics.to_dict()}
+
+    if features is not None and writer is None:
+        return process_stream(algorithm, inner, features, metrics)
+
+    if features is not None:
+        metrics = start_stream_metrics(metrics, inner)
+        try:
+            metadata = stream_features(algorithm, inner, features, writer.write_feature, metrics)
+            with metrics.phase('serialize'):
+                writer.close(metadata)
+        except Exception as e:
+            writer.abort()
+            return {**error_result(e), 'metrics': metrics.to_dict()}
+        metrics.set('output_features', writer.count)
+        result = {'success': True}
+        result_metrics = metrics.to_dict()
+    else:
+        result = process(algorithm, inner, input_geojson, metrics, cache_input)
+        if writer is None:
+            return result
+        if not result['success']:
+            writer.abort()
+            return result
+        data = result.pop('data')
+        metadata = result_metadata(data)
+        start = time.perf_counter()
+        try:
+            for feature in data.get('features') or []:
+                writer.write_feature(feature)
+            writer.close(metadata)
+        except Exception as e:
+            writer.abort()
+            return {**error_result(e), 'metrics': result['metrics']}
+        result_metrics = result.pop('metrics')
+        result_metrics['serialize_ms'] = round(result_metrics.get('serialize_ms', 0) + (time.perf_counter() - start) * 1000, 2)
+
+    result.update({'output_file': output_path, 'feature_count': writer.count})
+    if metadata:
+        result['metadata'] = metadata
+    result['metrics'] = result_metrics
+    return result
+
+
+def execute_measured(algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict],
+                     metrics: JobMetrics) -> Dict[str, Any]:
+    """execute() with to-geometry / compute timings, under cProfile with params['profile']"""
+    profile_path = params.get('profile')
+    profiler = None
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        # Nothing to convert for calls without input or with an unknown name
+        # (e.g. '__list__'), which must not pay for the NumPy / Shapely imports
+        if input_geojson is not None and (algorithm in ALGORITHMS or algorithm == PIPELINE):
+            from algorithms.utils import shape_collection
+            with metrics.phase('to_geometry'):
+                input_geojson = shape_collection(input_geojson)
+        with metrics.phase('compute'):
+            return execute(algorithm, params, input_geojson)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            metrics.set('profile', profile_path)
+
+
+def feature_count(data: Any) -> int:
+    """Number of features in a GeoJSON object (a bare geometry counts as one)"""
+    if not isinstance(data, dict):
+        return 0
+    features = data.get('features')
+    if isinstance(features, list):
+        return len(features)
+    return 1 if data.get('type') else 0
+
+
+def is_cacheable(algorithm: str, params: Dict[str, Any]) -> bool:
+    """Whether a call may be served from / stored in the result cache"""
+    if params.get('cache') is False:
+        return False
+    if algorithm == PIPELINE:
+        steps = params.get('steps') or []
+        return bool(steps) and isinstance(steps, list) and all(
+            isinstance(step, dict)
+            and step.get('algorithm') in ALGORITHMS and step.get('algorithm') not in UNCACHEABLE_ALGORITHMS
+            for step in steps
+        )
+    return algorithm in ALGORITHMS and algorithm not in UNCACHEABLE_ALGORITHMS
+
+
+def configure_cache(options: Dict[str, Any]):
+    """Enable the result cache from CLI options / environment (see result_cache.py)"""
+    global RESULT_CACHE
+    from result_cache import ResultCache
+    RESULT_CACHE = ResultCache.from_options(options)
+
+
+def execute(algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Execute a geoprocessing algorithm
 
@@ -52,7 +314,7 @@ def process(algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict
     Returns:
         Result dictionary with 'success', 'data' or 'error' keys
     """
-    if algorithm not in ALGORITHMS:
+    if algorithm != PIPELINE and algorithm not in ALGORITHMS:
         return {
             'success': False,
             'error': f"Unknown algorithm: {algorithm}",
@@ -60,25 +322,614 @@ def process(algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict
         }
 
     try:
-        result = ALGORITHMS[algorithm](input_geojson, params)
+        if algorithm == PIPELINE:
+            return apply_output_precision(process_pipeline(params.get('steps') or [], input_geojson), params)
+        module = load_algorithm(algorithm)
+        result = module.run(input_geojson, params)
+        return apply_output_precision({
+            'success': True,
+            'data': result,
+            'metrics': {'import_ms': take_import_ms(algorithm)}
+        }, params)
+    except Exception as e:
+        return error_result(e)
+
+
+def apply_output_precision(result: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Snap the features of a successful result to params['output_precision'] decimals"""
+    decimals = params.get('output_precision')
+    if decimals is None or not result['success']:
+        return result
+
+    data = result['data']
+    if isinstance(data, dict) and data.get('features'):
+        from algorithms.utils import snap_features
+        result['data'] = {**data, 'features': snap_features(data['features'], decimals)}
+    return result
+
+
+def snap_stream(features: Iterable[Dict], params: Dict[str, Any], batch_size: int = 1000) -> Iterable[Dict]:
+    """Apply params['output_precision'] to streamed features, one batch at a time"""
+    decimals = params.get('output_precision')
+    if decimals is None:
+        yield from features
+        return
+
+    from algorithms.utils import snap_features
+    batch = []
+    for feature in features:
+        batch.append(feature)
+        if len(batch) >= batch_size:
+            yield from snap_features(batch, decimals)
+            batch = []
+    yield from snap_features(batch, decimals)
+
+
+def process_pipeline(steps: List[Dict[str, Any]], input_geojson: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Execute a chain of algorithms in-process
+
+    Each step receives the previous step's result (a FeatureCollection whose
+    geometries are still Shapely objects), so intermediate results are never
+    serialized.
+
+    Args:
+        steps: Ordered list of {'algorithm': name, 'params': {...}}
+        input_geojson: Input GeoJSON for the first step
+
+    Returns:
+        Result dictionary with the last step's 'data' and a per-step 'steps' summary
+    """
+    if not steps:
+        return {
+            'success': False,
+            'error': "Parameter 'steps' is required for pipeline"
+        }
+    if not isinstance(steps, list):
         return {
+            'success': False,
+            'error': "Parameter 'steps' must be a list of {'algorithm': name, 'params': {...}}"
+        }
+
+    for i, step in enumerate(steps, 1):
+        if not isinstance(step, dict) or not isinstance(step.get('algorithm'), str):
+            return {
+                'success': False,
+                'error': f"Step {i}: must be an object with an 'algorithm' name"
+            }
+        if not isinstance(step.get('params') or {}, dict):
+            return {
+                'success': False,
+                'error': f"Step {i}: 'params' must be an object"
+            }
+        if step['algorithm'] not in ALGORITHMS:
+            return {
+                'success': False,
+                'error': f"Step {i}: unknown algorithm: {step.get('algorithm')}",
+                'available': list(ALGORITHMS.keys())
+            }
+
+    data = input_geojson
+    summary = []
+    import_ms = 0.0
+
+    from algorithms.progress import current
+    progress = current()
+
+    for i, step in enumerate(steps, 1):
+        algorithm = step['algorithm']
+        try:
+            module = load_algorithm(algorithm)
+            import_ms += take_import_ms(algorithm)
+            start = time.perf_counter()
+            progress.begin_step(f'{i}/{len(steps)} {algorithm}')
+            data = module.run(data, step.get('params') or {})
+        except Exception as e:
+            result = error_result(e)
+            result['error'] = f"Step {i} ({algorithm}): {e}"
+            return result
+        finally:
+            progress.begin_step(None)
+
+        summary.append({
+            'algorithm': algorithm,
+            'feature_count': len(data.get('features') or []),
+            'ms': round((time.perf_counter() - start) * 1000, 2)
+        })
+
+    return {
+        'success': True,
+        'data': data,
+        'steps': summary,
+        'metrics': {'import_ms': round(import_ms, 2)}
+    }
+
+
+def load_algorithm(algorithm: str):
+    """Import an algorithm module on first use and record how long it took"""
+    module_name = ALGORITHMS[algorithm]
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES[algorithm] = _unreported_imports[algorithm] = time.perf_counter() - start
+    return module
+
+
+def take_import_ms(algorithm: str) -> float:
+    """Import time (ms) paid by the current request - 0 once already reported"""
+    return round(_unreported_imports.pop(algorithm, 0.0) * 1000, 2)
+
+
+def can_stream(algorithm: str, params: Dict[str, Any]) -> bool:
+    """Whether an algorithm can process features incrementally with these params"""
+    if algorithm not in STREAMING_ALGORITHMS:
+        return False
+    return load_algorithm(algorithm).can_stream(params)
+
+
+def process_stream(algorithm: str, params: Dict[str, Any], features: Iterable[Dict],
+                   metrics: Optional[JobMetrics] = None) -> Dict[str, Any]:
+    """
+    Execute a per-feature algorithm over an iterable of features
+
+    Features are pulled one at a time (e.g. from a FeatureReader), so the
+    input collection is never materialized. Reading, conversion and the
+    algorithm interleave, so they are all timed as 'compute'.
+
+    Args:
+        algorithm: Algorithm name (must be in STREAMING_ALGORITHMS)
+        params: Algorithm parameters
+        features: Iterable of GeoJSON features
+        metrics: Metrics of the request so far
+
+    Returns:
+        Result dictionary with 'success', 'data' or 'error' keys and a 'metrics' block
+    """
+    metrics = start_stream_metrics(metrics, params)
+    try:
+        result_features = []
+        metadata = stream_features(algorithm, params, features, result_features.append, metrics)
+        data = {
+            'type': 'FeatureCollection',
+            'features': result_features
+        }
+        if metadata:
+            data['metadata'] = metadata
+        metrics.set('output_features', len(result_features))
+        result = {
             'success': True,
-            'data': result
+            'data': data
+        }
+    except json.JSONDecodeError as e:
+        result = {
+            'success': False,
+            'error': f'Invalid input GeoJSON: {e}'
         }
     except Exception as e:
+        result = error_result(e)
+
+    result['metrics'] = metrics.to_dict()
+    return result
+
+
+def stream_features(algorithm: str, params: Dict[str, Any], features: Iterable[Dict],
+                    write: Callable[[Dict], Any], metrics: JobMetrics) -> Dict[str, Any]:
+    """
+    Run a per-feature algorithm, passing each output feature to write()
+
+    Returns:
+        Collection-level metadata of the result
+    """
+    module = load_algorithm(algorithm)
+    metadata = {}
+    with metrics.phase('compute'):
+        features = counted(features, metrics, 'input_features')
+        for feature in snap_stream(module.stream(features, params, metadata), params):
+            write(feature)
+    metrics.set('import_ms', take_import_ms(algorithm))
+    return metadata
+
+
+def start_stream_metrics(metrics: Optional[JobMetrics], params: Dict[str, Any]) -> JobMetrics:
+    """Metrics for a streamed run, with the counters at zero"""
+    metrics = metrics or JobMetrics()
+    metrics.trace_memory(params.get('trace_memory'))
+    metrics.set('import_ms', 0.0)
+    metrics.set('input_features', 0)
+    metrics.set('output_features', 0)
+    return metrics
+
+
+def counted(items: Iterable, metrics: JobMetrics, key: str) -> Iterable:
+    """Pass items through, keeping their running count in metrics[key]"""
+    n = 0
+    for item in items:
+        n += 1
+        metrics.set(key, n)
+        yield item
+
+
+def write_sequence(algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict],
+                   features: Optional[Iterable[Dict]], writer: SequenceWriter,
+                   metrics: Optional[JobMetrics] = None) -> bool:
+    """
+    Execute an algorithm and write its features as a GeoJSON text sequence
+
+    Per-feature algorithms write each feature as soon as it is computed; other
+    algorithms are run whole and their features written afterwards. A final
+    status record carries success/error, collection-level metadata and metrics.
+
+    Args:
+        algorithm: Algorithm name
+        params: Algorithm parameters
+        input_geojson: Input GeoJSON (used when features is None)
+        features: Iterable of input features for streaming algorithms
+        writer: Destination SequenceWriter
+        metrics: Metrics of the request so far
+
+    Returns:
+        True on success
+    """
+    if features is None and can_stream(algorithm, params) and input_geojson:
+        features = input_geojson.get('features') or None
+
+    if features is not None:
+        metrics = start_stream_metrics(metrics, params)
+        try:
+            metadata = stream_features(algorithm, params, features, writer.write_feature, metrics)
+        except json.JSONDecodeError as e:
+            writer.write({'success': False, 'error': f'Invalid input GeoJSON: {e}', 'metrics': metrics.to_dict()})
+            return False
+        except Exception as e:
+            writer.write({**error_result(e), 'metrics': metrics.to_dict()})
+            return False
+        metrics = metrics.to_dict()
+    else:
+        result = process(algorithm, params, input_geojson, metrics)
+        if not result['success']:
+            writer.write(result)
+            return False
+        data = result['data']
+        start = time.perf_counter()
+        for feature in data.get('features') or []:
+            writer.write_feature(feature)
+        metadata = result_metadata(data)
+        metrics = result['metrics']
+        metrics['serialize_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+    metrics['output_features'] = writer.count
+    status = {'success': True, 'feature_count': writer.count}
+    if metadata:
+        status['metadata'] = metadata
+    status['metrics'] = metrics
+    writer.write(status)
+    return True
+
+
+def write_binary(result: Dict[str, Any]) -> bytes:
+    """
+    Encode a result dictionary as a QWKB payload (features + header members)
+
+    Like serialize_result, the encoding is timed as the serialize phase and
+    the metrics block spliced into the header afterwards.
+    """
+    import wkb_transport
+
+    members = {k: v for k, v in result.items() if k not in ('data', 'metrics')}
+    features = []
+    if 'data' in result:
+        data = result['data']
+        features = data.get('features') or []
+        metadata = result_metadata(data)
+        if metadata:
+            members['metadata'] = metadata
+
+    metrics = result.get('metrics')
+    if metrics is None:
+        return wkb_transport.write_collection(features, members)
+
+    start = time.perf_counter()
+    header, body = wkb_transport.encode_collection(features, members)
+    add_serialize_metrics(metrics, 0, time.perf_counter() - start)
+    return wkb_transport.pack(f'{header[:-1]}, "metrics": {dumps(metrics)}}}', body)
+
+
+def serialize_data(data: Dict[str, Any], metrics: JobMetrics) -> SerializedData:
+    """Result data serialized (timed as to_geojson / serialize), keeping its JSON text for reuse"""
+    with metrics.phase('to_geojson'):
+        texts = geometry_texts(data)
+    with metrics.phase('serialize'):
+        text = dumps(data) if texts is None else dumps_collection(data, texts)
+    return SerializedData(data, text)
+
+
+def serialize_result(result: Dict[str, Any]) -> str:
+    """
+    Serialize a result dictionary to JSON text
+
+    Geometries are converted to GeoJSON and the result serialized as two
+    timed phases, whose durations (and the final peak RSS) are then added
+    to the result's metrics block. Data already serialized (SerializedData,
+    e.g. for the result cache) is spliced in as-is.
+    """
+    metrics = result.get('metrics')
+    if metrics is None:
+        return dumps(result)
+
+    start = time.perf_counter()
+    body = {k: v for k, v in result.items() if k != 'metrics'}
+    data = body.get('data')
+    texts = geometry_texts(data) if not isinstance(data, SerializedData) else None
+    converted = time.perf_counter()
+    if isinstance(data, SerializedData):
+        del body['data']
+        text = f'{dumps(body)[:-1]}, "data": {data.text}}}'
+    elif texts is None:
+        text = dumps(body)
+    else:
+        # Geometry texts are spliced into the output instead of re-encoded
+        del body['data']
+        text = f'{dumps(body)[:-1]}, "data": {dumps_collection(data, texts)}}}'
+    done = time.perf_counter()
+
+    add_serialize_metrics(metrics, converted - start, done - converted)
+
+    # Splice the metrics block in, so serialize_ms covers the whole result
+    return f'{text[:-1]}, "metrics": {dumps(metrics)}}}'
+
+
+def add_serialize_metrics(metrics: Dict[str, Any], to_geojson: float, serialize: float):
+    """Add output encoding times (seconds) and the final peak RSS to a metrics block"""
+    # Added to the time already spent (writing an output file, caching the data)
+    metrics['to_geojson_ms'] = round(metrics.get('to_geojson_ms', 0) + to_geojson * 1000, 2)
+    metrics['serialize_ms'] = round(metrics.get('serialize_ms', 0) + serialize * 1000, 2)
+    peak = peak_rss_mb()
+    if peak is not None:
+        metrics['peak_rss_mb'] = round(max(peak, metrics.get('peak_rss_mb', 0)), 1)
+
+
+def result_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Collection-level members of an algorithm result, without its features"""
+    metadata = dict(data.get('metadata') or {})
+    metadata.update({k: v for k, v in data.items() if k not in ('type', 'features', 'metadata')})
+    return metadata
+
+
+def error_result(e: Exception) -> Dict[str, Any]:
+    """Result dictionary for an exception raised by an algorithm"""
+    from algorithms.progress import JobCancelled
+    if isinstance(e, JobCancelled):
+        return cancelled_result()
+    return {
+        'success': False,
+        'error': str(e),
+        'traceback': traceback.format_exc()
+    }
+
+
+def cancelled_result() -> Dict[str, Any]:
+    """Result dictionary of a cancelled job"""
+    return {
+        'success': False,
+        'cancelled': True,
+        'error': 'Job cancelled'
+    }
+
+
+def job_progress(request_id: Any, params: Dict[str, Any],
+                 cancelled: Optional[Callable[[Any], bool]] = None):
+    """
+    Progress tracker of one job (see algorithms/progress.py)
+
+    With params {"progress": true}, progress events are written to stderr as
+    JSON lines: {"type": "progress", "id": ..., "processed": n, "total": n,
+    "fraction": 0.42, "stage": ..., "step": ...} (total/fraction when known).
+
+    Args:
+        request_id: Request id echoed in the events (serve mode)
+        params: Request parameters
+        cancelled: Called with the request id, returns True once it is cancelled
+    """
+    from algorithms.progress import Progress
+
+    emit = None
+    if params.get('progress'):
+        def emit(event: Dict[str, Any]):
+            header = {'type': 'progress'}
+            if request_id is not None:
+                header['id'] = request_id
+            sys.stderr.write(json.dumps({**header, **event}) + '\n')
+            sys.stderr.flush()
+
+    is_cancelled = None
+    if cancelled and isinstance(request_id, (str, int, float)):
+        def is_cancelled() -> bool:
+            return cancelled(request_id)
+    return Progress(emit, is_cancelled)
+
+
+def cancel_message(line: str) -> Optional[Dict[str, Any]]:
+    """A cancel message {"cancel": <request id>}, None for any other line"""
+    # Cancel messages are tiny - requests are never parsed here
+    if len(line) > 256 or '"cancel"' not in line:
+        return None
+    try:
+        message = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if (isinstance(message, dict) and 'algorithm' not in message
+            and isinstance(message.get('cancel'), (str, int, float))):
+        return message
+    return None
+
+
+def handle_request(line: str, cancelled: Optional[Callable[[Any], bool]] = None) -> Dict[str, Any]:
+    """
+    Execute one newline-delimited JSON request (serve mode)
+
+    Args:
+        line: JSON text with 'algorithm', 'params', 'input' and optional 'id'
+        cancelled: Called with the request id, returns True once it is cancelled
+
+    Returns:
+        Result dictionary, with the request 'id' echoed back when present
+    """
+    metrics = JobMetrics()
+    try:
+        with metrics.phase('parse'):
+            request = json.loads(line)
+    except json.JSONDecodeError as e:
         return {
             'success': False,
-            'error': str(e),
-            'traceback': traceback.format_exc()
+            'error': f'Invalid request JSON: {e}',
+            'metrics': metrics.to_dict()
         }
 
+    if not isinstance(request, dict):
+        return {
+            'success': False,
+            'error': 'Request must be a JSON object',
+            'metrics': metrics.to_dict()
+        }
+
+    from algorithms.progress import tracking
+
+    try:
+        params = request.get('params') or {}
+        if not isinstance(params, dict):
+            raise ValueError("Request 'params' must be a JSON object")
+        progress = job_progress(request.get('id'), params, cancelled)
+        if progress.cancelled and progress.cancelled():
+            # Cancelled while queued
+            result = cancelled_result()
+            result['metrics'] = metrics.to_dict()
+        else:
+            with tracking(progress):
+                result = process(
+                    request.get('algorithm'),
+                    params,
+                    request.get('input'),
+                    metrics
+                )
+    except Exception as e:
+        # A bad request must never take the serve loop (or a pool worker) down
+        result = {**error_result(e), 'metrics': metrics.to_dict()}
+    if 'id' in request:
+        result['id'] = request['id']
+    return result
+
+
+def serve(stdin=None, stdout=None, pool=None):
+    """
+    Persistent worker loop - algorithms are imported once and reused
+
+    Reads one request per line until EOF and writes one response per line.
+    JSON never contains raw newlines, so a line is a complete frame.
+
+    A line {"cancel": <request id>} cancels a queued or running request: it
+    stops at its next progress check and answers {"success": false,
+    "cancelled": true}. Without a pool, requests run one at a time on this
+    thread while a reader thread keeps consuming stdin for cancel messages.
+
+    Args:
+        stdin: Request stream (default: sys.stdin)
+        stdout: Response stream (default: sys.stdout)
+        pool: Optional WorkerPool - requests then run concurrently in workers
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    lock = threading.Lock()
+
+    def write(response: str):
+        with lock:
+            stdout.write(response + '\n')
+            stdout.flush()
+
+    if pool:
+        for line in stdin:
+            if not line.strip():
+                continue
+            message = cancel_message(line)
+            if message is not None:
+                pool.cancel(message['cancel'])
+            else:
+                pool.submit(line, write)
+        pool.shutdown()
+        return
+
+    requests = queue.Queue()
+    cancelled = set()
+
+    def read():
+        for line in stdin:
+            if not line.strip():
+                continue
+            message = cancel_message(line)
+            if message is not None:
+                cancelled.add(message['cancel'])
+            else:
+                requests.put(line)
+        requests.put(None)
+
+    threading.Thread(target=read, name='qgls-reader', daemon=True).start()
+
+    while True:
+        line = requests.get()
+        if line is None:
+            break
+        result = handle_request(line, cancelled.__contains__)
+        if isinstance(result.get('id'), (str, int, float)):
+            cancelled.discard(result['id'])
+        write(serialize_result(result))
+
+
+def parse_options(args):
+    """Parse '--name value' and '--flag' command line options into a dict"""
+    options = {}
+    i = 0
+    while i < len(args):
+        name = args[i].lstrip('-').replace('-', '_')
+        if i + 1 < len(args) and not args[i + 1].startswith('--'):
+            options[name] = args[i + 1]
+            i += 2
+        else:
+            options[name] = True
+            i += 1
+    return options
+
+
+def create_pool(options: Dict[str, Any]):
+    """Build a WorkerPool from --pool / --workers / --timeout / --max-memory"""
+    if not options.get('pool') and 'workers' not in options:
+        return None
+
+    from worker_pool import WorkerPool
+
+    workers = options.get('workers')
+    max_memory = options.get('max_memory')
+    return WorkerPool(
+        workers=int(workers) if workers not in (None, True) else None,
+        timeout=float(options.get('timeout', 300)),
+        max_memory_mb=float(max_memory) if max_memory not in (None, True) else None,
+        options=options
+    )
+
 
 def main():
     """Main entry point - CLI interface"""
+    if len(sys.argv) >= 2 and sys.argv[1] == '--serve':
+        options = parse_options(sys.argv[2:])
+        configure_cache(options)
+        serve(pool=create_pool(options))
+        sys.exit(0)
+
     if len(sys.argv) < 2:
         print(json.dumps({
             'success': False,
-            'error': 'Usage: qgls_processor.py <algorithm> [params_json]',
+            'error': 'Usage: qgls_processor.py <algorithm> [params_json] | --serve [--pool]',
             'available': list(ALGORITHMS.keys())
         }))
         sys.exit(1)
@@ -97,25 +948,64 @@ def main():
             }))
             sys.exit(1)
 
+    configure_cache({})
+
     # Read input GeoJSON from stdin if available
+    metrics = JobMetrics()
     input_geojson = None
-    if not sys.stdin.isatty():
+    reader = None
+    input_format = params.get('input_format', 'geojson')
+    output_format = params.get('output_format', 'geojson')
+    if not sys.stdin.isatty() and not params.get('input_file'):
+        stream_input = can_stream(algorithm, params) and not (RESULT_CACHE and is_cacheable(algorithm, params))
         try:
-            stdin_data = sys.stdin.read()
-            if stdin_data.strip():
-                input_geojson = json.loads(stdin_data)
-        except json.JSONDecodeError as e:
+            with metrics.phase('parse'):
+                if input_format == 'wkb':
+                    import wkb_transport
+                    stdin_data = sys.stdin.buffer.read()
+                    if stdin_data:
+                        input_geojson = wkb_transport.read_collection(stdin_data)
+                elif stream_input:
+                    reader = FeatureReader(sys.stdin)
+                    if not reader.streaming:
+                        input_geojson = reader.document
+                        reader = None
+                else:
+                    stdin_data = sys.stdin.read()
+                    if stdin_data.strip():
+                        input_geojson = json.loads(stdin_data)
+        except (json.JSONDecodeError, ValueError) as e:
             print(json.dumps({
                 'success': False,
-                'error': f'Invalid input GeoJSON: {e}'
+                'error': f"Invalid input {'WKB' if input_format == 'wkb' else 'GeoJSON'}: {e}"
             }))
             sys.exit(1)
 
+    # A one-shot job is cancelled by terminating its process
+    from algorithms.progress import tracking
+    progress = job_progress(None, params)
+
+    # Streamed output - one feature per line
+    if output_format in SEQUENCE_FORMATS and not params.get('output_file'):
+        writer = SequenceWriter(sys.stdout, record_separator=SEQUENCE_FORMATS[output_format], flush=True)
+        with tracking(progress):
+            success = write_sequence(algorithm, params, input_geojson, reader, writer, metrics)
+        sys.stdout.flush()
+        sys.exit(0 if success else 1)
+
     # Process
-    result = process(algorithm, params, input_geojson)
+    with tracking(progress):
+        if reader:
+            result = process_stream(algorithm, params, reader, metrics)
+        else:
+            result = process(algorithm, params, input_geojson, metrics)
 
     # Output result
-    print(json.dumps(result))
+    if output_format == 'wkb':
+        sys.stdout.buffer.write(write_binary(result))
+        sys.stdout.flush()
+    else:
+        print(serialize_result(result))
     sys.exit(0 if result['success'] else 1)
 
 
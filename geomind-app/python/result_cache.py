@@ -0,0 +1,241 @@
+"""
+Result Cache - Content-addressed cache for geoprocessing results
+
+Results are keyed by a SHA-256 of (CACHE_VERSION, algorithm, normalized
+params, input payload). Two LRU tiers, both size-bounded and subject to a TTL:
+
+- memory: result members of the current process
+- disk (optional): serialized JSON files, shared between processes/workers
+
+Configuration (CLI option, or environment variable):
+    --cache / QGLS_CACHE=1                 enable the cache
+    --cache-dir / QGLS_CACHE_DIR           disk tier directory (enables the cache)
+    --cache-ttl / QGLS_CACHE_TTL           entry lifetime in seconds (default: 86400)
+    --cache-memory-mb / QGLS_CACHE_MEMORY_MB   memory tier size (default: 256)
+    --cache-disk-mb / QGLS_CACHE_DISK_MB       disk tier size (default: 1024)
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from geojson_stream import SerializedData, dumps, json_default
+
+# Part of every key - bump when an algorithm's results or the entry format
+# change, so entries written by an older version are never served
+CACHE_VERSION = 2
+
+# Params that change how a result is transported or measured, not the result itself
+TRANSPORT_PARAMS = {
+    'cache', 'input_format', 'min_chunk_size', 'output_format', 'profile', 'progress', 'trace_memory', 'workers'
+}
+
+
+def _normalize(value: Any) -> Any:
+    """Make equivalent params hash the same (10 == 10.0, key order)"""
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def _entry_prefix(created: float, entry: Dict[str, Any]) -> str:
+    """Disk entry text up to its data, which is written last: {"created": ..., <members>, "data": """
+    members = ''.join(f'{json.dumps(k)}: {dumps(v)}, ' for k, v in entry.items() if k != 'data')
+    return f'{{"created": {json.dumps(created)}, {members}"data": '
+
+
+class ResultCache:
+    """
+    Two-tier LRU result cache
+
+    Args:
+        directory: Disk tier directory (None = memory only)
+        ttl: Entry lifetime in seconds (None = no expiry)
+        memory_mb: Memory tier budget, measured on serialized size
+        disk_mb: Disk tier budget
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: Optional[float] = 86400,
+                 memory_mb: float = 256, disk_mb: float = 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.memory_budget = int(memory_mb * 1024 * 1024)
+        self.disk_budget = int(disk_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (created, size, data)
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._memory_size = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> Optional['ResultCache']:
+        """Build a cache from CLI options / environment, None when disabled"""
+        def option(name, env):
+            value = options.get(name)
+            return os.environ.get(env) if value in (None, True) else value
+
+        directory = option('cache_dir', 'QGLS_CACHE_DIR')
+        if not (options.get('cache') or os.environ.get('QGLS_CACHE') or directory):
+            return None
+
+        ttl = option('cache_ttl', 'QGLS_CACHE_TTL')
+        memory_mb = option('cache_memory_mb', 'QGLS_CACHE_MEMORY_MB')
+        disk_mb = option('cache_disk_mb', 'QGLS_CACHE_DISK_MB')
+        return cls(
+            directory=directory or None,
+            ttl=float(ttl) if ttl else 86400,
+            memory_mb=float(memory_mb) if memory_mb else 256,
+            disk_mb=float(disk_mb) if disk_mb else 1024
+        )
+
+    def key(self, algorithm: str, params: Dict[str, Any], input_geojson: Optional[Dict]) -> str:
+        """Content hash of an algorithm call"""
+        semantic = {k: v for k, v in params.items() if k not in TRANSPORT_PARAMS}
+        digest = hashlib.sha256()
+        digest.update(json.dumps([CACHE_VERSION, algorithm, _normalize(semantic)], sort_keys=True, default=json_default).encode())
+        digest.update(b'\0')
+        digest.update(json.dumps(input_geojson, sort_keys=True, default=json_default).encode())
+        return digest.hexdigest()
+
+    def info(self, hit: bool) -> Dict[str, Any]:
+        """Cache block for a response"""
+        return {'hit': hit, 'hits': self.hits, 'misses': self.misses}
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached result members ('data', plus e.g. a pipeline's 'steps'), or None (counts a hit or a miss)"""
+        data = self._get_memory(key)
+        if data is None and self.directory:
+            data = self._get_disk(key)
+
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, entry: Dict[str, Any], data_text: str):
+        """
+        Store result members in both tiers
+
+        Args:
+            key: Cache key
+            entry: Result members to store ('data', plus e.g. 'steps')
+            data_text: entry['data'] already serialized to JSON - it sizes the
+                entry and is written to the disk tier as-is, never re-encoded
+        """
+        created = time.time()
+        text = f'{_entry_prefix(created, entry)}{data_text}}}'
+        self._put_memory(key, entry, len(text), created)
+        if self.directory:
+            self._put_disk(key, text)
+
+    # -- memory tier ---------------------------------------------------------
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _get_memory(self, key: str) -> Optional[Dict]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        created, size, data = entry
+        if self._expired(created):
+            del self._memory[key]
+            self._memory_size -= size
+            return None
+        self._memory.move_to_end(key)
+        return data
+
+    def _put_memory(self, key: str, data: Dict, size: int, created: Optional[float] = None):
+        if size > self.memory_budget:
+            return
+        if key in self._memory:
+            self._memory_size -= self._memory.pop(key)[1]
+        self._memory[key] = (created or time.time(), size, data)
+        self._memory_size += size
+        while self._memory_size > self.memory_budget:
+            _, (_, evicted, _) = self._memory.popitem(last=False)
+            self._memory_size -= evicted
+
+    # -- disk tier -------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _get_disk(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            entry = json.loads(text)
+        except (OSError, ValueError):
+            return None
+
+        if self._expired(entry['created']):
+            self._remove(path)
+            return None
+
+        # mtime tracks recency for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        members = {k: v for k, v in entry.items() if k != 'created'}
+        prefix = _entry_prefix(entry['created'], members)
+        if isinstance(members.get('data'), dict) and text.startswith(prefix):
+            # The data text is the end of the file - keep it for the response
+            members['data'] = SerializedData(members['data'], text[len(prefix):-1])
+        self._put_memory(key, members, len(text), entry['created'])
+        return members
+
+    def _put_disk(self, key: str, text: str):
+        if len(text) > self.disk_budget:
+            return
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith('.json'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        except OSError:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.disk_budget:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,652 @@
+"""
+Vector Files - Read and write feature files directly in the processor
+
+Selected with params {"input_file": path} / {"output_file": path}, so large
+datasets never travel through the Node.js heap and the stdin/stdout pipes.
+The format follows the file extension:
+
+    .geojson .json                  GeoJSON, read incrementally (geojson_stream)
+    .geojsons .geojsonseq           GeoJSON text sequence (RFC 8142)
+    .geojsonl .ndjson .jsonl        newline-delimited GeoJSON features
+    .gpkg                           GeoPackage (sqlite3, memory-mapped reads)
+    .fgb and other OGR formats      via pyogrio (optional, bundles GDAL)
+
+Optional params:
+    input_layer     layer / table to read (default: the first feature layer)
+    output_layer    layer / table to write (default: file name)
+    output_srs_id   EPSG code recorded in GeoPackage / OGR output (default: 2056)
+
+Writers write to a temporary file that replaces the target on close(), so
+a failed job never leaves a truncated output behind.
+"""
+
+import abc
+import datetime
+import glob
+import json
+import math
+import os
+import pathlib
+import sqlite3
+import struct
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import shapely
+
+from algorithms.utils import geometry_array
+from geojson_stream import FeatureReader, SequenceWriter, dumps
+
+# Params handled here, never passed on to the algorithms
+FILE_PARAMS = {'input_file', 'input_layer', 'output_file', 'output_layer', 'output_srs_id'}
+
+DEFAULT_SRS_ID = 2056  # CH1903+ / LV95 (MN95)
+
+# Features converted from / to WKB per batch
+BATCH_SIZE = 1000
+
+# Features per pyogrio read / write call (bounds memory for OGR formats)
+OGR_BATCH_SIZE = 50000
+
+# OGR drivers that can start reading at a feature index without scanning
+# the file; other formats (e.g. KML, GML, CSV) are read in one call
+OGR_BATCHED_READ_DRIVERS = {'ESRI Shapefile', 'FlatGeobuf', 'GPKG'}
+
+# OGR drivers written in batches although pyogrio.list_drivers() does not
+# report them as appendable ('a'); the others are written in one call
+OGR_APPEND_DRIVERS = {'FlatGeobuf'}
+
+# Bytes of a GeoPackage memory-mapped by SQLite for reading
+GPKG_MMAP_SIZE = 1 << 30
+
+EXTENSIONS = {
+    '.geojson': 'geojson',
+    '.json': 'geojson',
+    '.geojsons': 'geojsonseq',
+    '.geojsonseq': 'geojsonseq',
+    '.geojsonl': 'ndjson',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.gpkg': 'gpkg',
+}
+
+# GeoPackage binary header: envelope size by envelope indicator
+GPKG_ENVELOPE_SIZES = {0: 0, 1: 32, 2: 48, 3: 48, 4: 64}
+GPKG_APPLICATION_ID = 0x47504B47  # 'GPKG'
+GPKG_USER_VERSION = 10200
+
+
+def file_format(path: str) -> str:
+    """Format name of a file from its extension ('ogr' when not handled natively)"""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'ogr')
+
+
+# -- reading -----------------------------------------------------------------
+
+def read_features(path: str, layer: Optional[str] = None,
+                  members: Optional[Dict[str, Any]] = None) -> Iterator[Dict]:
+    """
+    Yield the features of a file one at a time
+
+    Args:
+        path: Input file
+        layer: Layer to read (GeoPackage / OGR)
+        members: Filled with the other top-level members of a GeoJSON
+            FeatureCollection (complete once all features are read)
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Input file not found: {path}")
+
+    fmt = file_format(path)
+    if fmt == 'geojson':
+        return _read_geojson(path, members if members is not None else {})
+    if fmt in ('geojsonseq', 'ndjson'):
+        return _read_sequence(path)
+    if fmt == 'gpkg':
+        return _read_gpkg(path, layer)
+    return _read_ogr(path, layer)
+
+
+def read_collection(path: str, layer: Optional[str] = None) -> Dict[str, Any]:
+    """Read a whole file as a FeatureCollection (a GeoJSON geometry file is returned as-is)"""
+    if file_format(path) == 'geojson' and os.path.isfile(path):
+        with open(path, encoding='utf-8') as f:
+            reader = FeatureReader(f)
+            if not reader.streaming:
+                return reader.document
+            features = list(reader)
+            return {**reader.members, 'features': features}
+
+    members = {}
+    features = list(read_features(path, layer, members))
+    return {'type': 'FeatureCollection', **members, 'features': features}
+
+
+def _read_geojson(path: str, members: Dict[str, Any]) -> Iterator[Dict]:
+    with open(path, encoding='utf-8') as f:
+        reader = FeatureReader(f)
+        if not reader.streaming:
+            document = reader.document
+            if isinstance(document, dict) and document.get('type') == 'Feature':
+                yield document
+            elif document:
+                yield {'type': 'Feature', 'properties': {}, 'geometry': document}
+            return
+        yield from reader
+        members.update({k: v for k, v in reader.members.items() if k != 'type'})
+
+
+def _read_sequence(path: str) -> Iterator[Dict]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip(SequenceWriter.RS + ' \t\r\n')
+            if line:
+                yield json.loads(line)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _gpkg_wkb(blob: Optional[bytes]) -> Optional[bytes]:
+    """WKB part of a GeoPackage geometry blob"""
+    if blob is None:
+        return None
+    if blob[:2] != b'GP':
+        return bytes(blob)
+    envelope = GPKG_ENVELOPE_SIZES.get((blob[3] >> 1) & 0x07, 0)
+    return blob[8 + envelope:]
+
+
+def _gpkg_layer(conn: sqlite3.Connection, path: str, layer: Optional[str]):
+    """(table, geometry column) of a GeoPackage feature layer"""
+    query = (
+        "SELECT c.table_name, g.column_name FROM gpkg_contents c "
+        "JOIN gpkg_geometry_columns g ON g.table_name = c.table_name "
+        "WHERE c.data_type = 'features'"
+    )
+    args = ()
+    if layer:
+        query += " AND c.table_name = ?"
+        args = (layer,)
+    row = conn.execute(query, args).fetchone()
+    if row is None:
+        raise ValueError(f"No feature layer {layer!r} in {path}" if layer else f"No feature layer in {path}")
+    return row
+
+
+def _read_gpkg(path: str, layer: Optional[str]) -> Iterator[Dict]:
+    uri = pathlib.Path(path).resolve().as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        conn.execute(f'PRAGMA mmap_size = {GPKG_MMAP_SIZE}')
+        table, column = _gpkg_layer(conn, path, layer)
+        columns = conn.execute(f'PRAGMA table_info({_quote(table)})').fetchall()
+        pk = next((info[1] for info in columns if info[5]), None)
+        booleans = {info[1] for info in columns if info[2].upper() == 'BOOLEAN'}
+
+        cursor = conn.execute(f'SELECT * FROM {_quote(table)}')
+        names = [d[0] for d in cursor.description]
+        geom_index = names.index(column)
+        pk_index = names.index(pk) if pk in names else None
+        fields = [(i, name, name in booleans) for i, name in enumerate(names) if i not in (geom_index, pk_index)]
+
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            geometries = shapely.from_wkb(np.array([_gpkg_wkb(row[geom_index]) for row in rows], dtype=object))
+            for row, geometry in zip(rows, geometries):
+                feature = {
+                    'type': 'Feature',
+                    'properties': {
+                        name: bool(row[i]) if boolean and row[i] is not None else _plain(row[i])
+                        for i, name, boolean in fields
+                    },
+                    'geometry': geometry
+                }
+                if pk_index is not None:
+                    feature['id'] = row[pk_index]
+                yield feature
+    finally:
+        conn.close()
+
+
+def _pyogrio():
+    try:
+        import pyogrio
+        return pyogrio
+    except ImportError:
+        raise ValueError(
+            "Reading / writing this format requires pyogrio. Install with: pip install pyogrio"
+        ) from None
+
+
+def _read_ogr(path: str, layer: Optional[str]) -> Iterator[Dict]:
+    pyogrio = _pyogrio()
+    batched = pyogrio.read_info(path, layer=layer)['driver'] in OGR_BATCHED_READ_DRIVERS
+    skip = 0
+    while True:
+        meta, fids, geometry, field_data = pyogrio.raw.read(
+            path, layer=layer, return_fids=True,
+            skip_features=skip, max_features=OGR_BATCH_SIZE if batched else None
+        )
+        fields = list(meta['fields'])
+
+        for start in range(0, len(geometry), BATCH_SIZE):
+            shapes = shapely.from_wkb(geometry[start:start + BATCH_SIZE])
+            for offset, shape in enumerate(shapes):
+                i = start + offset
+                yield {
+                    'type': 'Feature',
+                    'id': int(fids[i]),
+                    'properties': {name: _plain(values[i]) for name, values in zip(fields, field_data)},
+                    'geometry': shape
+                }
+
+        if not batched or len(geometry) < OGR_BATCH_SIZE:
+            break
+        skip += len(geometry)
+
+
+def _plain(value: Any) -> Any:
+    """JSON-friendly attribute value"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+# -- writing -----------------------------------------------------------------
+
+def open_writer(path: str, layer: Optional[str] = None, srs_id: Optional[int] = None):
+    """Feature writer for a file, by extension (see the module docstring)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Output directory not found: {directory}")
+
+    layer = layer or os.path.splitext(os.path.basename(path))[0]
+    srs_id = int(srs_id or DEFAULT_SRS_ID)
+
+    fmt = file_format(path)
+    if fmt == 'geojson':
+        return GeoJSONFileWriter(path)
+    if fmt in ('geojsonseq', 'ndjson'):
+        return SequenceFileWriter(path, record_separator=fmt == 'geojsonseq')
+    if fmt == 'gpkg':
+        return GeoPackageWriter(path, layer, srs_id)
+    _pyogrio()
+    return OgrWriter(path, layer, srs_id)
+
+
+class _FileWriter(abc.ABC):
+    """Common part of the writers: temporary file, feature count, commit / abort"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = f'{path}.{os.getpid()}.tmp'
+        self.count = 0
+
+    @abc.abstractmethod
+    def write_feature(self, feature: Dict):
+        """Add one feature to the file"""
+
+    def close(self, members: Optional[Dict[str, Any]] = None):
+        """Finish the file and move it into place"""
+        self._finish(members or {})
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Drop the partial output"""
+        try:
+            self._discard()
+        finally:
+            try:
+                os.remove(self.tmp_path)
+            except OSError:
+                pass
+
+    def _finish(self, members: Dict[str, Any]):
+        pass
+
+    def _discard(self):
+        pass
+
+
+class GeoJSONFileWriter(_FileWriter):
+    """FeatureCollection written feature by feature (collection members last)"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        self.file.write('{"type": "FeatureCollection", "features": [\n')
+
+    def write_feature(self, feature: Dict):
+        if self.count:
+            self.file.write(',\n')
+        self.file.write(dumps(feature))
+        self.count += 1
+
+    def _finish(self, members):
+        self.file.write('\n]')
+        for key, value in members.items():
+            if key not in ('type', 'features'):
+                self.file.write(f', {json.dumps(key)}: {dumps(value)}')
+        self.file.write('}\n')
+        self.file.close()
+
+    def _discard(self):
+        self.file.close()
+
+
+class SequenceFileWriter(_FileWriter):
+    """One feature per line (RS-prefixed for GeoJSONSeq)"""
+
+    def __init__(self, path: str, record_separator: bool):
+        super().__init__(path)
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        self.writer = SequenceWriter(self.file, record_separator=record_separator)
+
+    def write_feature(self, feature: Dict):
+        self.writer.write_feature(feature)
+        self.count += 1
+
+    def _finish(self, members):
+        self.file.close()
+
+    def _discard(self):
+        self.file.close()
+
+
+def _sql_type(value: Any) -> str:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return 'BOOLEAN'
+    if isinstance(value, int):
+        return 'INTEGER'
+    if isinstance(value, float):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (dict, list, tuple)):
+        return dumps(value)
+    return value
+
+
+class GeoPackageWriter(_FileWriter):
+    """
+    Single-layer GeoPackage
+
+    Columns are added as new property names appear, typed from their first
+    non-null value; a name clashing with another column regardless of case
+    (SQLite column names are case-insensitive, e.g. 'Name' / 'name', or
+    fid / geom) gets a '_' suffix. Geometries are stored as GeoPackage
+    binary (header without envelope + ISO WKB); the layer extent is
+    recorded on close.
+    """
+
+    def __init__(self, path: str, layer: str, srs_id: int):
+        super().__init__(path)
+        self.table = layer
+        self.srs_id = srs_id
+        self.columns: Dict[str, str] = {}  # property -> column name
+        self._column_keys = {'fid', 'geom'}  # column names in use, lower case (SQLite ignores case)
+        self.bounds = [math.inf, math.inf, -math.inf, -math.inf]
+        self.geometry_types = set()
+        self.has_z = False
+        self._batch: List[Dict] = []
+        self._header = struct.pack('<2sBBi', b'GP', 0, 0x01, srs_id)
+        self._empty_header = struct.pack('<2sBBi', b'GP', 0, 0x11, srs_id)
+
+        self.conn = sqlite3.connect(self.tmp_path)
+        self._create()
+
+    def _create(self):
+        conn = self.conn
+        conn.execute(f'PRAGMA application_id = {GPKG_APPLICATION_ID}')
+        conn.execute(f'PRAGMA user_version = {GPKG_USER_VERSION}')
+        conn.executescript('''
+            CREATE TABLE gpkg_spatial_ref_sys (
+                srs_name TEXT NOT NULL, srs_id INTEGER PRIMARY KEY, organization TEXT NOT NULL,
+                organization_coordsys_id INTEGER NOT NULL, definition TEXT NOT NULL, description TEXT);
+            CREATE TABLE gpkg_contents (
+                table_name TEXT NOT NULL PRIMARY KEY, data_type TEXT NOT NULL, identifier TEXT UNIQUE,
+                description TEXT DEFAULT '',
+                last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+                min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE,
+                srs_id INTEGER REFERENCES gpkg_spatial_ref_sys(srs_id));
+            CREATE TABLE gpkg_geometry_columns (
+                table_name TEXT NOT NULL, column_name TEXT NOT NULL, geometry_type_name TEXT NOT NULL,
+                srs_id INTEGER NOT NULL, z TINYINT NOT NULL, m TINYINT NOT NULL,
+                PRIMARY KEY (table_name, column_name));
+        ''')
+        srs = [
+            ('Undefined cartesian SRS', -1, 'NONE', -1, 'undefined'),
+            ('Undefined geographic SRS', 0, 'NONE', 0, 'undefined'),
+            ('WGS 84 geodetic', 4326, 'EPSG', 4326, 'undefined'),
+        ]
+        if self.srs_id not in (-1, 0, 4326):
+            srs.append((f'EPSG:{self.srs_id}', self.srs_id, 'EPSG', self.srs_id, 'undefined'))
+        conn.executemany(
+            'INSERT INTO gpkg_spatial_ref_sys (srs_name, srs_id, organization, organization_coordsys_id, definition) '
+            'VALUES (?, ?, ?, ?, ?)', srs
+        )
+        conn.execute(f'CREATE TABLE {_quote(self.table)} (fid INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL, geom GEOMETRY)')
+
+    def write_feature(self, feature: Dict):
+        self._batch.append(feature)
+        if len(self._batch) >= BATCH_SIZE:
+            self._flush()
+
+    def _add_columns(self, features: List[Dict]):
+        for feature in features:
+            for name, value in (feature.get('properties') or {}).items():
+                if name in self.columns or value is None:
+                    continue
+                column = name
+                while column.lower() in self._column_keys:
+                    column += '_'
+                self._column_keys.add(column.lower())
+                self.conn.execute(f'ALTER TABLE {_quote(self.table)} ADD COLUMN {_quote(column)} {_sql_type(value)}')
+                self.columns[name] = column
+
+    def _flush(self):
+        features, self._batch = self._batch, []
+        if not features:
+            return
+
+        geoms = geometry_array(features)
+        blobs = shapely.to_wkb(geoms, byte_order=1, flavor='iso')
+        empty = shapely.is_empty(geoms)
+
+        present = geoms[shapely.is_geometry(geoms) & ~empty]
+        if len(present):
+            minx, miny, maxx, maxy = shapely.total_bounds(present)
+            self.bounds = [min(self.bounds[0], minx), min(self.bounds[1], miny),
+                           max(self.bounds[2], maxx), max(self.bounds[3], maxy)]
+            self.geometry_types.update(g.geom_type for g in present)
+            self.has_z = self.has_z or bool(shapely.has_z(present).any())
+
+        self._add_columns(features)
+        names = list(self.columns)
+        columns = ', '.join(['geom'] + [_quote(self.columns[name]) for name in names])
+        placeholders = ', '.join('?' * (len(names) + 1))
+
+        rows = []
+        for feature, blob, is_empty in zip(features, blobs, empty):
+            if blob is not None:
+                blob = (self._empty_header if is_empty else self._header) + blob
+            properties = feature.get('properties') or {}
+            rows.append([blob] + [_sql_value(properties.get(name)) for name in names])
+
+        self.conn.executemany(f'INSERT INTO {_quote(self.table)} ({columns}) VALUES ({placeholders})', rows)
+        self.count += len(rows)
+
+    def _finish(self, members):
+        self._flush()
+        types = {t.upper() for t in self.geometry_types}
+        type_name = types.pop() if len(types) == 1 else 'GEOMETRY'
+        bounds = self.bounds if self.count and math.isfinite(self.bounds[0]) else [None] * 4
+
+        self.conn.execute(
+            'INSERT INTO gpkg_contents (table_name, data_type, identifier, min_x, min_y, max_x, max_y, srs_id) '
+            "VALUES (?, 'features', ?, ?, ?, ?, ?, ?)",
+            (self.table, self.table, *bounds, self.srs_id)
+        )
+        self.conn.execute(
+            'INSERT INTO gpkg_geometry_columns (table_name, column_name, geometry_type_name, srs_id, z, m) '
+            'VALUES (?, ?, ?, ?, ?, 0)',
+            (self.table, 'geom', type_name, self.srs_id, 1 if self.has_z else 0)
+        )
+        self.conn.commit()
+        self.conn.close()
+
+    def _discard(self):
+        self.conn.close()
+
+
+class OgrWriter(_FileWriter):
+    """
+    Any OGR format through pyogrio (e.g. FlatGeobuf)
+
+    OGR layers need all their fields when created, so features are spooled
+    to a temporary SQLite file (WKB + JSON properties) while the field
+    types are collected, then written on close - in batches of
+    OGR_BATCH_SIZE where the driver can append to a layer.
+    """
+
+    def __init__(self, path: str, layer: str, srs_id: int):
+        super().__init__(path)
+        # GDAL picks the driver from the extension, keep it on the temporary file
+        root, ext = os.path.splitext(path)
+        self.tmp_path = f'{root}.{os.getpid()}.tmp{ext}'
+        self.spool_path = f'{root}.{os.getpid()}.spool'
+        self.layer = layer
+        self.srs_id = srs_id
+        self.fields: Dict[str, set] = {}  # property -> types of its non-null values
+        self._batch: List[Dict] = []
+
+        self.spool = sqlite3.connect(self.spool_path)
+        self.spool.execute('CREATE TABLE features (geometry BLOB, properties TEXT)')
+
+    def write_feature(self, feature: Dict):
+        self._batch.append(feature)
+        self.count += 1
+        if len(self._batch) >= BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        features, self._batch = self._batch, []
+        if not features:
+            return
+
+        blobs = shapely.to_wkb(geometry_array(features))
+        rows = []
+        for feature, blob in zip(features, blobs):
+            properties = {}
+            for name, value in (feature.get('properties') or {}).items():
+                if isinstance(value, np.generic):
+                    value = value.item()
+                kinds = self.fields.setdefault(name, set())
+                if value is not None:
+                    kinds.add(type(value))
+                properties[name] = value
+            rows.append((blob, json.dumps(properties, default=str)))
+        self.spool.executemany('INSERT INTO features VALUES (?, ?)', rows)
+
+    def _finish(self, members):
+        pyogrio = _pyogrio()
+        self._flush()
+        names = list(self.fields)
+        dtypes = [_field_dtype(self.fields[name]) for name in names]
+        driver = pyogrio.detect_write_driver(self.path)
+        if driver in OGR_APPEND_DRIVERS or 'a' in pyogrio.list_drivers().get(driver, ''):
+            batch_size = OGR_BATCH_SIZE
+        else:
+            batch_size = max(self.count, 1)
+
+        cursor = self.spool.execute('SELECT geometry, properties FROM features ORDER BY rowid')
+        layer = self.layer
+        append = False
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if append and not rows:
+                break
+            properties = [json.loads(row[1]) for row in rows]
+            columns = [_column_array([p.get(name) for p in properties], dtype) for name, dtype in zip(names, dtypes)]
+            pyogrio.raw.write(
+                self.tmp_path, np.array([row[0] for row in rows], dtype=object),
+                [values for values, _ in columns], names, field_mask=[mask for _, mask in columns],
+                layer=layer, driver=driver, geometry_type='Unknown', crs=f'EPSG:{self.srs_id}',
+                append=append
+            )
+            if not append:
+                # Append to the layer as created (Shapefile names it after the file)
+                layer = pyogrio.read_info(self.tmp_path)['layer_name']
+                append = True
+            if len(rows) < batch_size:
+                break
+        self._discard()
+
+    def close(self, members: Optional[Dict[str, Any]] = None):
+        super().close(members)
+        # Multi-file formats (Shapefile .dbf, .shx, .prj ...): move the other files too
+        for tmp_file, file in self._sidecars():
+            os.replace(tmp_file, file)
+
+    def abort(self):
+        try:
+            super().abort()
+        finally:
+            for tmp_file, _ in self._sidecars():
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+
+    def _sidecars(self):
+        tmp_root, root = os.path.splitext(self.tmp_path)[0], os.path.splitext(self.path)[0]
+        return [(f, root + f[len(tmp_root):]) for f in glob.glob(glob.escape(tmp_root) + '.*')]
+
+    def _discard(self):
+        self.spool.close()
+        try:
+            os.remove(self.spool_path)
+        except OSError:
+            pass
+
+
+def _field_dtype(kinds: set):
+    """numpy dtype of an OGR field from the types of its values"""
+    if kinds == {bool}:
+        return bool
+    if kinds and kinds <= {int}:
+        return np.int64
+    if kinds and kinds <= {int, float}:
+        return np.float64
+    return object
+
+
+def _column_array(values: List[Any], dtype):
+    """Typed numpy column for pyogrio, and its null mask (None without nulls)"""
+    if dtype is object:
+        return np.array([v if v is None or isinstance(v, str) else _text(v) for v in values], dtype=object), None
+    nulls = np.array([v is None for v in values], dtype=bool)
+    column = np.array([0 if v is None else v for v in values], dtype=dtype)
+    return column, (nulls if nulls.any() else None)
+
+
+def _text(value: Any) -> str:
+    return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
@@ -0,0 +1,350 @@
+"""
+Worker Pool - Bounded pool of persistent processor workers
+
+Keeps N worker processes alive (default: CPU count), each running
+qgls_processor requests. Jobs are queued and handed to idle workers,
+every job has a timeout (counted from submission, so time spent queued
+is included), and workers that crash or exceed a memory limit are
+restarted.
+
+cancel(id) drops a queued job, or asks the worker running it to stop at
+its next progress check; a worker that has not answered CANCEL_GRACE
+seconds later (e.g. stuck in one long GEOS call) is killed and restarted.
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# How often a busy worker is checked for timeout / memory (seconds)
+POLL_INTERVAL = 0.25
+
+# How long a cancelled job may take to stop on its own before its worker is killed (seconds)
+CANCEL_GRACE = 2.0
+
+# Request id at the start of a request line, as written by the Node bridge
+_LEADING_ID = re.compile(r'\s*\{\s*"id"\s*:\s*(-?\d+|"[^"\\]*")\s*[,}]')
+
+# Per-request timeout, a leading member (after the id) so large inputs are never parsed here
+_LEADING_TIMEOUT = re.compile(
+    r'\s*\{\s*(?:"id"\s*:\s*(?:-?\d+|"[^"\\]*")\s*,\s*)?"timeout"\s*:\s*(-?\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)\s*[,}]'
+)
+
+
+def _worker_main(conn, options, cancel_event):
+    """Worker process loop - receives request lines, sends response lines"""
+    import qgls_processor
+    qgls_processor.configure_cache(options)
+
+    def cancelled(request_id) -> bool:
+        return cancel_event.is_set()
+
+    while True:
+        try:
+            line = conn.recv()
+        except (EOFError, OSError):
+            break
+        if line is None:
+            break
+        result = qgls_processor.handle_request(line, cancelled)
+        conn.send(qgls_processor.serialize_result(result))
+
+
+def process_rss_mb(pid: int) -> Optional[float]:
+    """
+    Resident memory of a process in MB
+
+    Uses psutil when installed, /proc on Linux, otherwise returns None
+    (memory limits are then not enforced).
+    """
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _request_id(line: str) -> Any:
+    """Extract the request id - only needed for error responses and cancellation"""
+    match = _LEADING_ID.match(line)
+    if match:
+        return json.loads(match.group(1))
+    try:
+        request = json.loads(line)
+        return request.get('id') if isinstance(request, dict) else None
+    except json.JSONDecodeError:
+        return None
+
+
+def _request_timeout(line: str, default: float) -> float:
+    """
+    Per-request timeout override ('timeout' in seconds)
+
+    Only honoured as the first member of the request, or the second after
+    'id': the line is forwarded as-is and never fully parsed by the pool.
+    """
+    match = _LEADING_TIMEOUT.match(line)
+    if not match or float(match.group(1)) <= 0:
+        return default
+    return float(match.group(1))
+
+
+def _error_line(line: str, message: str, **members) -> str:
+    result = {'success': False, 'error': message, **members}
+    request_id = _request_id(line)
+    if request_id is not None:
+        result['id'] = request_id
+    return json.dumps(result)
+
+
+class _Worker:
+    """One supervised worker process"""
+
+    def __init__(self, context, options):
+        self.context = context
+        self.options = options
+        self.process = None
+        self.conn = None
+        self.jobs_done = 0
+
+        # Job currently running (request line and id) and its cancellation state
+        self.line = None
+        self.request_id = None
+        self.cancel_event = context.Event()
+        self.cancel_deadline = None
+
+    def start(self):
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_worker_main,
+            args=(child_conn, self.options, self.cancel_event),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.jobs_done = 0
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def stop(self, kill: bool = False):
+        if self.process is None:
+            return
+        if not kill:
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=2)
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+
+class WorkerPool:
+    """
+    Bounded pool of processor workers
+
+    Args:
+        workers: Number of worker processes (default: CPU count)
+        timeout: Default per-job timeout in seconds (default: 300)
+        max_memory_mb: Restart a worker whose RSS exceeds this (default: no limit)
+        options: Serve options forwarded to each worker (e.g. cache settings)
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: float = 300,
+                 max_memory_mb: Optional[float] = None, options: Optional[Dict[str, Any]] = None):
+        self.size = max(1, int(workers or os.cpu_count() or 1))
+        self.timeout = float(timeout)
+        self.max_memory_mb = max_memory_mb
+        self.options = dict(options or {})
+        self.stats = {'completed': 0, 'timeouts': 0, 'crashes': 0, 'memory_restarts': 0,
+                      'cancelled': 0, 'cancel_kills': 0}
+
+        self._context = multiprocessing.get_context('spawn')
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._workers = []
+        self._queued = {}  # id -> number of queued jobs with that id
+        self._cancelled = set()  # ids of cancelled jobs still in the queue
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._idle = threading.Condition()
+
+        for i in range(self.size):
+            thread = threading.Thread(target=self._dispatch, name=f'qgls-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, line: str, callback: Callable[[str], None]):
+        """Queue a request line, callback receives the response line"""
+        request_id = _request_id(line)
+        with self._idle:
+            self._pending += 1
+        with self._lock:
+            self._queued[request_id] = self._queued.get(request_id, 0) + 1
+        self._jobs.put((line, callback, time.monotonic(), request_id))
+
+    def run(self, line: str) -> str:
+        """Execute a request line and wait for its response line"""
+        done = threading.Event()
+        response = []
+
+        def callback(result):
+            response.append(result)
+            done.set()
+
+        self.submit(line, callback)
+        done.wait()
+        return response[0]
+
+    def cancel(self, request_id: Any):
+        """Cancel a queued or running job by request id (unknown or finished ids are ignored)"""
+        if request_id is None:
+            return
+        with self._lock:
+            for worker in self._workers:
+                if worker.line is not None and worker.request_id == request_id:
+                    worker.cancel_event.set()
+                    worker.cancel_deadline = time.monotonic() + CANCEL_GRACE
+                    return
+            if request_id in self._queued:
+                self._cancelled.add(request_id)
+
+    def join(self):
+        """Wait until every submitted job has been answered"""
+        with self._idle:
+            while self._pending:
+                self._idle.wait()
+
+    def shutdown(self):
+        """Stop all workers once queued jobs are done"""
+        self.join()
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _dispatch(self):
+        """Dispatcher thread - owns one worker and feeds it jobs"""
+        worker = _Worker(self._context, self.options)
+        with self._lock:
+            self._workers.append(worker)
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                worker.stop()
+                return
+
+            line, callback, submitted, request_id = job
+            with self._lock:
+                if self._queued[request_id] > 1:
+                    self._queued[request_id] -= 1
+                else:
+                    del self._queued[request_id]
+                skip = request_id in self._cancelled
+                if skip:
+                    self._cancelled.discard(request_id)
+                    self.stats['cancelled'] += 1
+                else:
+                    worker.line = line
+                    worker.request_id = request_id
+                    worker.cancel_event.clear()
+                    worker.cancel_deadline = None
+
+            timeout = _request_timeout(line, self.timeout)
+            if skip:
+                response = _error_line(line, 'Job cancelled', cancelled=True)
+            elif time.monotonic() - submitted > timeout:
+                # Expired while queued - not started at all
+                with self._lock:
+                    worker.line = None
+                    self.stats['timeouts'] += 1
+                response = _error_line(line, f'Job timed out after {timeout:g} s')
+            else:
+                if not worker.alive():
+                    worker.start()
+                try:
+                    response = self._execute(worker, line, submitted + timeout, timeout)
+                except Exception as e:
+                    worker.stop(kill=True)
+                    response = _error_line(line, f'Worker error: {e}')
+                finally:
+                    with self._lock:
+                        if worker.cancel_deadline is not None:
+                            self.stats['cancelled'] += 1
+                        worker.line = None
+                        worker.cancel_deadline = None
+
+            try:
+                callback(response)
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
+
+    def _execute(self, worker: _Worker, line: str, deadline: float, timeout: float) -> str:
+        """Send one job to a worker and supervise it until it answers or its deadline passes"""
+        worker.conn.send(line)
+
+        while True:
+            if worker.conn.poll(POLL_INTERVAL):
+                try:
+                    response = worker.conn.recv()
+                except (EOFError, OSError):
+                    return self._crashed(worker, line)
+                worker.jobs_done += 1
+                self.stats['completed'] += 1
+                if self._over_memory(worker):
+                    self.stats['memory_restarts'] += 1
+                    worker.stop()
+                return response
+
+            if not worker.alive():
+                return self._crashed(worker, line)
+
+            if worker.cancel_deadline is not None and time.monotonic() > worker.cancel_deadline:
+                self.stats['cancel_kills'] += 1
+                worker.stop(kill=True)
+                return _error_line(line, 'Job cancelled', cancelled=True)
+
+            if time.monotonic() > deadline:
+                self.stats['timeouts'] += 1
+                worker.stop(kill=True)
+                return _error_line(line, f'Job timed out after {timeout:g} s')
+
+            if self._over_memory(worker):
+                self.stats['memory_restarts'] += 1
+                worker.stop(kill=True)
+                return _error_line(line, f'Worker exceeded memory limit ({self.max_memory_mb:g} MB)')
+
+    def _crashed(self, worker: _Worker, line: str) -> str:
+        self.stats['crashes'] += 1
+        exitcode = worker.process.exitcode if worker.process else None
+        worker.stop(kill=True)
+        return _error_line(line, f'Worker crashed (exit code {exitcode})')
+
+    def _over_memory(self, worker: _Worker) -> bool:
+        if not self.max_memory_mb or not worker.alive():
+            return False
+        rss = process_rss_mb(worker.process.pid)
+        return rss is not None and rss > self.max_memory_mb
@@ -7,8 +7,8 @@ import 'dotenv/config';
 import express from 'express';
 import cors from 'cors';
 import { readFile, writeFile, readdir, stat, mkdir } from 'fs/promises';
-import { existsSync, readFileSync, writeFileSync, mkdirSync } from 'fs';
-import { join, dirname } from 'path';
+import { existsSync, readFileSync, writeFileSync, mkdirSync, realpathSync } from 'fs';
+import { join, dirname, basename, resolve, relative, isAbsolute, sep } from 'path';
 import { fileURLToPath } from 'url';
 import { homedir } from 'os';
 import { exec } from 'child_process';
@@ -4207,27 +4207,134 @@ app.post('/api/pyqgis/install', async (req, res) => {
   }
 });
 
+// Cancel a geoprocessing job when its client disconnects
+function abortOnClose(res) {
+  const controller = new AbortController();
+  res.on('close', () => {
+    if (!res.writableEnded) {
+      controller.abort();
+    }
+  });
+  return controller.signal;
+}
+
+// Params naming server-side files. input_file / output_file are only accepted
+// inside PYQGIS_DATA_DIR (refused when it is not set); profile (a cProfile dump
+// path, a debugging aid of the CLI) is dropped from HTTP requests.
+const PYQGIS_FILE_PARAMS = ['input_file', 'output_file'];
+const PYQGIS_DATA_DIR = process.env.PYQGIS_DATA_DIR ? resolve(process.env.PYQGIS_DATA_DIR) : null;
+
+/**
+ * Check the params of an HTTP geoprocessing request
+ * @returns {{ params?: Object, error?: string }} params with file paths resolved, or an error
+ */
+function checkPyqgisParams(params) {
+  if (params == null) {
+    return { params: {} };
+  }
+  if (typeof params !== 'object' || Array.isArray(params)) {
+    return { error: 'params must be an object' };
+  }
+
+  const { profile, ...checked } = params;
+  for (const name of PYQGIS_FILE_PARAMS) {
+    if (checked[name] == null) continue;
+    if (!PYQGIS_DATA_DIR) {
+      return { error: `Parameter '${name}' is not enabled on this server (set PYQGIS_DATA_DIR)` };
+    }
+    if (typeof checked[name] !== 'string') {
+      return { error: `Parameter '${name}' must be a path` };
+    }
+
+    // Resolve symlinks (of the directory only when the file does not exist yet)
+    const file = resolve(PYQGIS_DATA_DIR, checked[name]);
+    let real, rel;
+    try {
+      real = existsSync(file) ? realpathSync(file) : join(realpathSync(dirname(file)), basename(file));
+      rel = relative(realpathSync(PYQGIS_DATA_DIR), real);
+    } catch {
+      return { error: `Parameter '${name}': directory not found` };
+    }
+    if (!rel || rel.split(sep)[0] === '..' || isAbsolute(rel)) {
+      return { error: `Parameter '${name}' must be a file inside the data directory` };
+    }
+    checked[name] = real;
+  }
+  return { params: checked };
+}
+
 // Run geoprocessing algorithm
+// With { progress: true } the response is NDJSON: progress events, then { type: 'result', ... }
 app.post('/api/pyqgis/process', async (req, res) => {
   const bridge = getPyqgisBridge();
   if (!bridge) {
     return res.status(500).json({ error: 'PyQGIS bridge not loaded' });
   }
 
-  const { algorithm, params, inputGeoJSON } = req.body;
+  const { algorithm, params, inputGeoJSON, progress } = req.body;
 
   if (!algorithm) {
     return res.status(400).json({ error: 'Algorithm name required' });
   }
+  const checked = checkPyqgisParams(params);
+  if (checked.error) {
+    return res.status(400).json({ success: false, error: checked.error });
+  }
+
+  const options = { signal: abortOnClose(res) };
+  if (progress) {
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    options.onProgress = (event) => res.write(JSON.stringify(event) + '\n');
+  }
 
   try {
-    const result = await bridge.runAlgorithm(algorithm, params || {}, inputGeoJSON);
-    res.json(result);
+    const result = await bridge.runAlgorithm(algorithm, checked.params, inputGeoJSON, options);
+    if (progress) {
+      res.end(JSON.stringify({ type: 'result', ...result }) + '\n');
+    } else {
+      res.json(result);
+    }
   } catch (err) {
-    res.status(500).json({
-      success: false,
-      error: err.message
-    });
+    if (progress) {
+      res.end(JSON.stringify({ type: 'result', success: false, error: err.message }) + '\n');
+    } else {
+      res.status(500).json({
+        success: false,
+        error: err.message
+      });
+    }
+  }
+});
+
+// Run geoprocessing algorithm, streaming features back as NDJSON
+app.post('/api/pyqgis/process-stream', async (req, res) => {
+  const bridge = getPyqgisBridge();
+  if (!bridge) {
+    return res.status(500).json({ error: 'PyQGIS bridge not loaded' });
+  }
+
+  const { algorithm, params, inputGeoJSON, progress } = req.body;
+
+  if (!algorithm) {
+    return res.status(400).json({ error: 'Algorithm name required' });
+  }
+  const checked = checkPyqgisParams(params);
+  if (checked.error) {
+    return res.status(400).json({ success: false, error: checked.error });
+  }
+
+  const write = (record) => res.write(JSON.stringify(record) + '\n');
+  const options = { signal: abortOnClose(res) };
+  if (progress) {
+    options.onProgress = write;
+  }
+
+  res.setHeader('Content-Type', 'application/x-ndjson');
+  try {
+    const status = await bridge.runAlgorithmStream(algorithm, checked.params, inputGeoJSON, write, options);
+    res.end(JSON.stringify(status) + '\n');
+  } catch (err) {
+    res.end(JSON.stringify({ success: false, error: err.message }) + '\n');
   }
 });
 
@@ -8,6 +8,7 @@
 const { spawn } = require('child_process');
 const path = require('path');
 const fs = require('fs');
+const os = require('os');
 
 // Python paths - order of preference
 const PYTHON_PATHS = [
@@ -157,21 +158,291 @@ async function installDependencies() {
   });
 }
 
+/**
+ * Progress events and cancellation
+ *
+ * With params.progress, the processor writes progress events to stderr as JSON
+ * lines ({"type": "progress", "id", "processed", "total", "fraction", "stage"}).
+ * Persistent jobs are cancelled with a {"cancel": id} line, one-shot jobs by
+ * killing their process; both resolve with { success: false, cancelled: true }.
+ */
+const CANCELLED_RESULT = { success: false, cancelled: true, error: 'Job cancelled' };
+
+/**
+ * Split a child's stderr into lines - progress events go to onProgress, the rest is logged
+ */
+function createStderrHandler(onProgress) {
+  let buffer = '';
+  return (data) => {
+    buffer += data.toString();
+    let newline;
+    while ((newline = buffer.indexOf('\n')) >= 0) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      if (!line) continue;
+
+      const event = parseProgress(line);
+      if (event) {
+        onProgress(event);
+      } else {
+        console.error('[Python stderr]', line);
+      }
+    }
+  };
+}
+
+function parseProgress(line) {
+  if (!line.startsWith('{"type": "progress"')) {
+    return null;
+  }
+  try {
+    return JSON.parse(line);
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Call onAbort when an AbortSignal fires, returns a function removing the listener
+ */
+function watchAbort(signal, onAbort) {
+  if (!signal) {
+    return () => {};
+  }
+  signal.addEventListener('abort', onAbort, { once: true });
+  return () => signal.removeEventListener('abort', onAbort);
+}
+
+/**
+ * Params for the processor - progress events are only emitted on request
+ */
+function withProgress(params, options) {
+  return options.onProgress ? { ...params, progress: true } : params;
+}
+
+/**
+ * Persistent worker (qgls_processor.py --serve --pool)
+ *
+ * One long-lived Python supervisor answers newline-delimited JSON requests.
+ * It runs them on a bounded pool of worker processes (one per CPU by default),
+ * enforces per-job timeouts and restarts crashed workers, so interpreter
+ * startup and module imports are paid only once per worker.
+ */
+let worker = null;
+let workerStarting = null;
+
+function startWorker(pythonPath) {
+  const args = [PROCESSOR_SCRIPT, '--serve', '--pool'];
+  if (process.env.PYQGIS_WORKERS) {
+    args.push('--workers', process.env.PYQGIS_WORKERS);
+  }
+  if (process.env.PYQGIS_MAX_MEMORY_MB) {
+    args.push('--max-memory', process.env.PYQGIS_MAX_MEMORY_MB);
+  }
+
+  // Result cache shared by all workers (opt-in: PYQGIS_CACHE=1 or PYQGIS_CACHE_DIR)
+  if (process.env.PYQGIS_CACHE === '1' || process.env.PYQGIS_CACHE_DIR) {
+    args.push('--cache-dir', process.env.PYQGIS_CACHE_DIR || path.join(os.tmpdir(), 'geomind-qgls-cache'));
+    if (process.env.PYQGIS_CACHE_TTL) {
+      args.push('--cache-ttl', process.env.PYQGIS_CACHE_TTL);
+    }
+  }
+
+  const proc = spawn(pythonPath, args, {
+    windowsHide: true,
+    env: {
+      ...process.env,
+      PYTHONIOENCODING: 'utf-8'
+    }
+  });
+
+  const state = {
+    proc,
+    pending: new Map(),
+    nextId: 1,
+    buffer: ''
+  };
+
+  proc.stdout.on('data', (data) => {
+    state.buffer += data.toString();
+
+    let newline;
+    while ((newline = state.buffer.indexOf('\n')) >= 0) {
+      const line = state.buffer.slice(0, newline);
+      state.buffer = state.buffer.slice(newline + 1);
+      if (!line.trim()) continue;
+
+      let result;
+      try {
+        result = JSON.parse(line);
+      } catch (parseError) {
+        console.error('[PyQGIS Bridge] Invalid worker response:', parseError.message);
+        continue;
+      }
+
+      const job = state.pending.get(result.id);
+      if (job) {
+        state.pending.delete(result.id);
+        clearTimeout(job.timer);
+        delete result.id;
+        job.resolve(result);
+      }
+    }
+  });
+
+  proc.stderr.on('data', createStderrHandler((event) => {
+    const job = state.pending.get(event.id);
+    if (job && job.onProgress) {
+      job.onProgress(event);
+    }
+  }));
+
+  const fail = (message) => {
+    if (worker === state) {
+      worker = null;
+    }
+    for (const job of state.pending.values()) {
+      clearTimeout(job.timer);
+      job.resolve({ success: false, error: message });
+    }
+    state.pending.clear();
+  };
+
+  proc.on('exit', (code) => fail(`Python worker exited (code ${code})`));
+  proc.on('error', (err) => fail(`Failed to spawn Python worker: ${err.message}`));
+
+  return state;
+}
+
+async function getWorker() {
+  if (worker) {
+    return worker;
+  }
+
+  // Concurrent first calls share a single startup
+  if (!workerStarting) {
+    workerStarting = findPython()
+      .then((pythonPath) => {
+        worker = startWorker(pythonPath);
+        return worker;
+      })
+      .finally(() => {
+        workerStarting = null;
+      });
+  }
+  return workerStarting;
+}
+
+/**
+ * Stop the persistent worker (it is restarted on the next request)
+ *
+ * Closing stdin lets the pool shut its workers down cleanly; the process is
+ * killed if it is still running after STOP_GRACE_MS.
+ */
+const STOP_GRACE_MS = 2000;
+
+function stopWorker() {
+  if (worker) {
+    const state = worker;
+    worker = null;
+    state.proc.stdin.end();
+    setTimeout(() => {
+      if (state.proc.exitCode === null && state.proc.signalCode === null) {
+        state.proc.kill();
+      }
+    }, STOP_GRACE_MS).unref();
+  }
+}
+
+/**
+ * Time allowed for the pool's own timeout answer to arrive before a job is
+ * cancelled from here
+ */
+const TIMEOUT_GRACE_MS = 5000;
+
 /**
  * Run a Python geoprocessing algorithm
  *
+ * Large datasets should not go through Node: pass params.input_file (and
+ * inputGeoJSON = null) and/or params.output_file instead, the Python side
+ * then reads / writes the file itself and returns only its metadata.
+ *
  * @param {string} algorithm - Algorithm name
  * @param {Object} params - Algorithm parameters
  * @param {Object|null} inputGeoJSON - Input GeoJSON (optional)
  * @param {Object} options - Execution options
- * @returns {Promise<Object>} - Result with success, data/error
+ * @param {number} options.timeout - Timeout in ms (default: 60000)
+ * @param {boolean} options.persistent - Use the persistent worker (default: true)
+ * @param {Function} options.onProgress - Called with each progress event (optional)
+ * @param {AbortSignal} options.signal - Cancels the job when aborted (optional)
+ * @returns {Promise<Object>} - Result with success, data/error (cancelled: true when aborted)
  */
 async function runAlgorithm(algorithm, params = {}, inputGeoJSON = null, options = {}) {
+  if (options.persistent === false) {
+    return runAlgorithmOnce(algorithm, params, inputGeoJSON, options);
+  }
+  if (options.signal?.aborted) {
+    return { ...CANCELLED_RESULT };
+  }
+
+  const state = await getWorker();
+  const timeout = options.timeout || 60000; // 1 minute default
+
+  return new Promise((resolve) => {
+    const id = state.nextId++;
+
+    const unwatch = watchAbort(options.signal, () => {
+      if (state.pending.has(id)) {
+        state.proc.stdin.write(JSON.stringify({ cancel: id }) + '\n');
+      }
+    });
+    const finish = (result) => {
+      unwatch();
+      resolve(result);
+    };
+
+    // The pool enforces the job timeout itself, counted from submission like
+    // this timer; if its answer does not arrive in time, cancel just this job
+    // (other in-flight jobs keep running)
+    const timer = setTimeout(() => {
+      state.pending.delete(id);
+      state.proc.stdin.write(JSON.stringify({ cancel: id }) + '\n');
+      finish({
+        success: false,
+        error: `Algorithm timed out after ${timeout} ms`
+      });
+    }, timeout + TIMEOUT_GRACE_MS);
+
+    state.pending.set(id, { resolve: finish, timer, onProgress: options.onProgress });
+    // id and timeout lead the line: the pool reads them without parsing the input
+    state.proc.stdin.write(JSON.stringify({
+      id,
+      timeout: timeout / 1000,
+      algorithm,
+      params: withProgress(params, options),
+      input: inputGeoJSON
+    }) + '\n');
+  });
+}
+
+/**
+ * Run a Python geoprocessing algorithm in a fresh process
+ *
+ * @param {string} algorithm - Algorithm name
+ * @param {Object} params - Algorithm parameters
+ * @param {Object|null} inputGeoJSON - Input GeoJSON (optional)
+ * @param {Object} options - Execution options (timeout, onProgress, signal - see runAlgorithm)
+ * @returns {Promise<Object>} - Result with success, data/error
+ */
+async function runAlgorithmOnce(algorithm, params = {}, inputGeoJSON = null, options = {}) {
+  if (options.signal?.aborted) {
+    return { ...CANCELLED_RESULT };
+  }
   const pythonPath = await findPython();
   const timeout = options.timeout || 60000; // 1 minute default
 
   return new Promise((resolve, reject) => {
-    const args = [PROCESSOR_SCRIPT, algorithm, JSON.stringify(params)];
+    const args = [PROCESSOR_SCRIPT, algorithm, JSON.stringify(withProgress(params, options))];
 
     const proc = spawn(pythonPath, args, {
       timeout,
@@ -189,9 +460,16 @@ async function runAlgorithm(algorithm, params = {}, inputGeoJSON = null, options
       stdout += data.toString();
     });
 
+    const logStderr = createStderrHandler(options.onProgress || (() => {}));
     proc.stderr.on('data', (data) => {
       stderr += data.toString();
-      console.error('[Python stderr]', data.toString().trim());
+      logStderr(data);
+    });
+
+    let aborted = false;
+    const unwatch = watchAbort(options.signal, () => {
+      aborted = true;
+      proc.kill();
     });
 
     // Send input GeoJSON via stdin
@@ -201,6 +479,11 @@ async function runAlgorithm(algorithm, params = {}, inputGeoJSON = null, options
     proc.stdin.end();
 
     proc.on('close', (code) => {
+      unwatch();
+      if (aborted) {
+        resolve({ ...CANCELLED_RESULT });
+        return;
+      }
       try {
         const result = JSON.parse(stdout);
         resolve(result);
@@ -224,6 +507,262 @@ async function runAlgorithm(algorithm, params = {}, inputGeoJSON = null, options
   });
 }
 
+/**
+ * Run an algorithm and receive features as they are produced
+ *
+ * The processor writes one feature per line (NDJSON) followed by a final
+ * status record, so features can be forwarded before the job finishes.
+ *
+ * @param {string} algorithm - Algorithm name
+ * @param {Object} params - Algorithm parameters
+ * @param {Object|null} inputGeoJSON - Input GeoJSON (optional)
+ * @param {Function} onFeature - Called with each output feature
+ * @param {Object} options - Execution options (timeout, onProgress, signal - see runAlgorithm)
+ * @returns {Promise<Object>} - Final status with success, feature_count, metadata/error
+ */
+async function runAlgorithmStream(algorithm, params = {}, inputGeoJSON = null, onFeature = () => {}, options = {}) {
+  if (options.signal?.aborted) {
+    return { ...CANCELLED_RESULT };
+  }
+  const pythonPath = await findPython();
+  const timeout = options.timeout || 60000; // 1 minute default
+
+  return new Promise((resolve) => {
+    const args = [PROCESSOR_SCRIPT, algorithm, JSON.stringify({ ...withProgress(params, options), output_format: 'ndjson' })];
+
+    const proc = spawn(pythonPath, args, {
+      timeout,
+      windowsHide: true,
+      env: {
+        ...process.env,
+        PYTHONIOENCODING: 'utf-8'
+      }
+    });
+
+    let buffer = '';
+    let status = null;
+    let stderr = '';
+
+    const handleLine = (line) => {
+      if (!line.trim()) return;
+      let record;
+      try {
+        record = JSON.parse(line);
+      } catch (parseError) {
+        status = { success: false, error: `Failed to parse Python output: ${parseError.message}` };
+        return;
+      }
+      if (record.type === 'Feature') {
+        onFeature(record);
+      } else {
+        status = record;
+      }
+    };
+
+    proc.stdout.on('data', (data) => {
+      buffer += data.toString();
+      let newline;
+      while ((newline = buffer.indexOf('\n')) >= 0) {
+        handleLine(buffer.slice(0, newline));
+        buffer = buffer.slice(newline + 1);
+      }
+    });
+
+    const logStderr = createStderrHandler(options.onProgress || (() => {}));
+    proc.stderr.on('data', (data) => {
+      stderr += data.toString();
+      logStderr(data);
+    });
+
+    let aborted = false;
+    const unwatch = watchAbort(options.signal, () => {
+      aborted = true;
+      proc.kill();
+    });
+
+    if (inputGeoJSON) {
+      proc.stdin.write(JSON.stringify(inputGeoJSON));
+    }
+    proc.stdin.end();
+
+    proc.on('close', (code) => {
+      unwatch();
+      if (aborted) {
+        resolve({ ...CANCELLED_RESULT });
+        return;
+      }
+      handleLine(buffer);
+      resolve(status || {
+        success: false,
+        error: 'Python process ended without a status record',
+        stderr,
+        exitCode: code
+      });
+    });
+
+    proc.on('error', (err) => {
+      resolve({
+        success: false,
+        error: `Failed to spawn Python process: ${err.message}`
+      });
+    });
+  });
+}
+
+/**
+ * Binary feature collections (QWKB) - see python/wkb_transport.py
+ *
+ * Layout: 'QWKB' | uint32 header length | JSON header | uint32[count] WKB lengths | WKB blobs
+ * Geometries are WKB Buffers (e.g. straight from PostGIS ST_AsBinary), attributes
+ * travel in the header, so coordinates are never converted to JSON text.
+ */
+const WKB_MAGIC = 'QWKB';
+
+/**
+ * Encode geometries and attributes into a QWKB payload
+ *
+ * @param {Object} collection - { geometries: Buffer[], properties?: Object[], ids?: Array, ...members }
+ * @returns {Buffer}
+ */
+function encodeWkbCollection({ geometries, properties, ids, ...members }) {
+  const header = {
+    ...members,
+    count: geometries.length,
+    properties: properties || geometries.map(() => ({}))
+  };
+  if (ids) {
+    header.ids = ids;
+  }
+
+  const headerBytes = Buffer.from(JSON.stringify(header), 'utf-8');
+  const prefix = Buffer.alloc(8);
+  prefix.write(WKB_MAGIC, 0, 'ascii');
+  prefix.writeUInt32LE(headerBytes.length, 4);
+
+  const lengths = Buffer.alloc(4 * geometries.length);
+  geometries.forEach((wkb, i) => lengths.writeUInt32LE(wkb ? wkb.length : 0, 4 * i));
+
+  return Buffer.concat([prefix, headerBytes, lengths, ...geometries.filter(Boolean)]);
+}
+
+/**
+ * Decode a QWKB payload
+ *
+ * @param {Buffer} payload
+ * @returns {Object} - Header members plus geometries: (Buffer|null)[]
+ */
+function decodeWkbCollection(payload) {
+  if (payload.length < 8 || payload.toString('ascii', 0, 4) !== WKB_MAGIC) {
+    throw new Error('Invalid WKB payload');
+  }
+
+  const headerLength = payload.readUInt32LE(4);
+  let offset = 8;
+  const header = JSON.parse(payload.toString('utf-8', offset, offset + headerLength));
+  offset += headerLength;
+
+  const count = header.count || 0;
+  const lengths = [];
+  for (let i = 0; i < count; i++) {
+    lengths.push(payload.readUInt32LE(offset + 4 * i));
+  }
+  offset += 4 * count;
+
+  const geometries = lengths.map((length) => {
+    if (!length) return null;
+    const wkb = payload.subarray(offset, offset + length);
+    offset += length;
+    return wkb;
+  });
+
+  return { ...header, geometries };
+}
+
+/**
+ * Run an algorithm with binary (QWKB) input and output
+ *
+ * @param {string} algorithm - Algorithm name
+ * @param {Object} params - Algorithm parameters
+ * @param {Buffer|null} inputPayload - Input from encodeWkbCollection() (optional)
+ * @param {Object} options - Execution options (timeout, onProgress, signal - see runAlgorithm)
+ * @returns {Promise<Object>} - Decoded result (success, geometries, properties, metadata) or error
+ */
+async function runAlgorithmBinary(algorithm, params = {}, inputPayload = null, options = {}) {
+  if (options.signal?.aborted) {
+    return { ...CANCELLED_RESULT };
+  }
+  const pythonPath = await findPython();
+  const timeout = options.timeout || 60000; // 1 minute default
+
+  return new Promise((resolve) => {
+    const binaryParams = { ...withProgress(params, options), output_format: 'wkb' };
+    if (inputPayload) {
+      binaryParams.input_format = 'wkb';
+    }
+
+    const proc = spawn(pythonPath, [PROCESSOR_SCRIPT, algorithm, JSON.stringify(binaryParams)], {
+      timeout,
+      windowsHide: true,
+      env: {
+        ...process.env,
+        PYTHONIOENCODING: 'utf-8'
+      }
+    });
+
+    const chunks = [];
+    let stderr = '';
+
+    proc.stdout.on('data', (data) => { chunks.push(data); });
+    const logStderr = createStderrHandler(options.onProgress || (() => {}));
+    proc.stderr.on('data', (data) => {
+      stderr += data.toString();
+      logStderr(data);
+    });
+
+    let aborted = false;
+    const unwatch = watchAbort(options.signal, () => {
+      aborted = true;
+      proc.kill();
+    });
+
+    if (inputPayload) {
+      proc.stdin.write(inputPayload);
+    }
+    proc.stdin.end();
+
+    proc.on('close', (code) => {
+      unwatch();
+      if (aborted) {
+        resolve({ ...CANCELLED_RESULT });
+        return;
+      }
+      const output = Buffer.concat(chunks);
+      try {
+        resolve(decodeWkbCollection(output));
+      } catch {
+        // Errors raised before the binary writer (e.g. bad params) are JSON
+        try {
+          resolve(JSON.parse(output.toString('utf-8')));
+        } catch (parseError) {
+          resolve({
+            success: false,
+            error: `Failed to parse Python output: ${parseError.message}`,
+            stderr,
+            exitCode: code
+          });
+        }
+      }
+    });
+
+    proc.on('error', (err) => {
+      resolve({
+        success: false,
+        error: `Failed to spawn Python process: ${err.message}`
+      });
+    });
+  });
+}
+
 /**
  * List available algorithms
  */
@@ -240,6 +779,8 @@ async function listAlgorithms() {
     'dissolve',
     'simplify',
     'voronoi',
+    'delaunay',
+    'tin',
     'convex_hull',
     'centroid',
     'grid',
@@ -290,6 +831,12 @@ module.exports = {
   checkDependencies,
   installDependencies,
   runAlgorithm,
+  runAlgorithmOnce,
+  runAlgorithmStream,
+  runAlgorithmBinary,
+  encodeWkbCollection,
+  decodeWkbCollection,
+  stopWorker,
   listAlgorithms,
   getStatus
 };
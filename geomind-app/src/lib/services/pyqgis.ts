@@ -22,7 +22,54 @@ export interface ProcessResult {
   data?: GeoJSON.FeatureCollection;
   error?: string;
   traceback?: string;
+  cancelled?: boolean;
+  /** Set when params.output_file was given - the features are in that file, not in data */
+  output_file?: string;
+  feature_count?: number;
   metadata?: Record<string, any>;
+  metrics?: ProcessMetrics;
+  steps?: PipelineStepSummary[];
+}
+
+export interface ProcessMetrics {
+  parse_ms: number;
+  to_geometry_ms: number;
+  compute_ms: number;
+  to_geojson_ms: number;
+  serialize_ms: number;
+  import_ms?: number;
+  input_features?: number;
+  output_features?: number;
+  peak_rss_mb?: number;
+  traced_peak_mb?: number;
+  profile?: string;
+}
+
+export interface JobProgress {
+  type: 'progress';
+  processed: number;
+  total?: number;
+  fraction?: number;
+  stage?: string;
+  step?: string;
+}
+
+export interface RunOptions {
+  /** Called with progress events while the job runs */
+  onProgress?: (progress: JobProgress) => void;
+  /** Aborting cancels the job on the server */
+  signal?: AbortSignal;
+}
+
+export interface PipelineStep {
+  algorithm: string;
+  params?: Record<string, any>;
+}
+
+export interface PipelineStepSummary {
+  algorithm: string;
+  feature_count: number;
+  ms: number;
 }
 
 /**
@@ -75,16 +122,25 @@ export async function installDependencies(): Promise<{ success: boolean; error?:
 export async function runAlgorithm(
   algorithm: string,
   params: Record<string, any> = {},
-  inputGeoJSON?: GeoJSON.FeatureCollection | GeoJSON.Feature
+  inputGeoJSON?: GeoJSON.FeatureCollection | GeoJSON.Feature,
+  options: RunOptions = {}
 ): Promise<ProcessResult> {
+  const progress = !!options.onProgress;
   try {
     const res = await fetch(`${API_BASE}/process`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ algorithm, params, inputGeoJSON })
+      body: JSON.stringify({ algorithm, params, inputGeoJSON, progress }),
+      signal: options.signal
     });
-    return await res.json();
+    if (!progress) {
+      return await res.json();
+    }
+    return await readProgressResponse(res, options.onProgress!);
   } catch (err) {
+    if (options.signal?.aborted) {
+      return { success: false, cancelled: true, error: 'Job cancelled' };
+    }
     return {
       success: false,
       error: err instanceof Error ? err.message : 'Failed to run algorithm'
@@ -92,6 +148,48 @@ export async function runAlgorithm(
   }
 }
 
+/**
+ * Read an NDJSON process response: progress events, then the result record
+ */
+async function readProgressResponse(
+  res: Response,
+  onProgress: (progress: JobProgress) => void
+): Promise<ProcessResult> {
+  if (!res.body) {
+    return { success: false, error: 'Empty response' };
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result: ProcessResult | null = null;
+
+  const handleLine = (line: string) => {
+    if (!line.trim()) return;
+    const record = JSON.parse(line);
+    if (record.type === 'progress') {
+      onProgress(record);
+    } else {
+      const { type, ...rest } = record;
+      result = rest;
+    }
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let newline;
+    while ((newline = buffer.indexOf('\n')) >= 0) {
+      handleLine(buffer.slice(0, newline));
+      buffer = buffer.slice(newline + 1);
+    }
+  }
+  handleLine(buffer);
+
+  return result ?? { success: false, error: 'No result received' };
+}
+
 // Algorithm-specific helpers
 
 /**
@@ -105,6 +203,13 @@ export async function buffer(
     capStyle?: 'round' | 'flat' | 'square';
     joinStyle?: 'round' | 'mitre' | 'bevel';
     dissolve?: boolean;
+    /** Property holding a per-feature distance (distance is then the fallback) */
+    distanceField?: string;
+    /** Multiplier applied to distanceField values, e.g. 0.0005 for a diameter in mm */
+    distanceFactor?: number;
+    /** Multi-ring buffer - one output feature per feature and distance (distance is then ignored) */
+    distances?: number[];
+    ringMode?: 'ring' | 'nested';
   } = {}
 ): Promise<ProcessResult> {
   return runAlgorithm('buffer', {
@@ -112,7 +217,11 @@ export async function buffer(
     segments: options.segments ?? 16,
     cap_style: options.capStyle ?? 'round',
     join_style: options.joinStyle ?? 'round',
-    dissolve: options.dissolve ?? false
+    dissolve: options.dissolve ?? false,
+    distance_field: options.distanceField,
+    distance_factor: options.distanceFactor,
+    distances: options.distances,
+    ring_mode: options.ringMode
   }, input);
 }
 
@@ -121,11 +230,25 @@ export async function buffer(
  */
 export async function dissolve(
   input: GeoJSON.FeatureCollection,
-  field?: string
+  field?: string | string[],
+  options: {
+    /** Property -> aggregate function(s), e.g. { $length: 'sum', annee: ['min', 'max'] } */
+    aggregates?: Record<string, DissolveAggregate | DissolveAggregate[]>;
+    /** 'adjacent' merges only touching / overlapping geometries (output lists source_ids) */
+    mode?: 'group' | 'adjacent';
+    workers?: number | 'auto';
+  } = {}
 ): Promise<ProcessResult> {
-  return runAlgorithm('dissolve', { field }, input);
+  return runAlgorithm('dissolve', {
+    ...(Array.isArray(field) ? { fields: field } : { field }),
+    aggregates: options.aggregates,
+    mode: options.mode,
+    workers: options.workers
+  }, input);
 }
 
+export type DissolveAggregate = 'sum' | 'min' | 'max' | 'mean' | 'first' | 'count' | 'count_distinct';
+
 /**
  * Simplify geometries
  */
@@ -140,6 +263,24 @@ export async function simplify(
   }, input);
 }
 
+/**
+ * Simplify features at several tolerances in one call (level-of-detail pyramid)
+ *
+ * Every feature is returned once per level (its levels consecutively, finest
+ * first) with 'lod' (0 = finest) and 'tolerance' properties; metadata.levels
+ * holds per-level vertex totals.
+ */
+export async function simplifyLevels(
+  input: GeoJSON.FeatureCollection,
+  tolerances: number[],
+  preserveTopology: boolean = true
+): Promise<ProcessResult> {
+  return runAlgorithm('simplify', {
+    tolerances,
+    preserve_topology: preserveTopology
+  }, input);
+}
+
 /**
  * Generate Voronoi polygons
  */
@@ -151,13 +292,49 @@ export async function voronoi(
 }
 
 /**
- * Generate convex hull
+ * Delaunay triangulation (TIN) of points
+ * With a numeric field (or '$z'), triangles carry <field>_min/_max/_mean;
+ * output 'raster' instead interpolates the field linearly onto a grid,
+ * returned in data.raster (values row by row from the north, null = no data).
+ */
+export async function delaunay(
+  input: GeoJSON.FeatureCollection,
+  options: {
+    field?: string;
+    output?: 'triangles' | 'raster';
+    cellSize?: number;
+    extent?: [number, number, number, number];
+    maxEdgeLength?: number;
+  } = {}
+): Promise<ProcessResult> {
+  return runAlgorithm('delaunay', {
+    field: options.field,
+    output: options.output ?? 'triangles',
+    cell_size: options.cellSize,
+    extent: options.extent,
+    max_edge_length: options.maxEdgeLength
+  }, input);
+}
+
+/**
+ * Generate convex hull (or a concave hull with hullType 'concave')
  */
 export async function convexHull(
   input: GeoJSON.FeatureCollection,
-  groupBy?: string
+  groupBy?: string,
+  options: {
+    hullType?: 'convex' | 'concave';
+    /** Concave hull ratio, 0 (most concave) to 1 (convex) */
+    ratio?: number;
+    allowHoles?: boolean;
+  } = {}
 ): Promise<ProcessResult> {
-  return runAlgorithm('convex_hull', { group_by: groupBy }, input);
+  return runAlgorithm('convex_hull', {
+    group_by: groupBy,
+    hull_type: options.hullType,
+    ratio: options.ratio,
+    allow_holes: options.allowHoles
+  }, input);
 }
 
 /**
@@ -190,6 +367,17 @@ export async function grid(
   }, clipGeometry);
 }
 
+/**
+ * Run several algorithms in a single call (e.g. buffer → dissolve → simplify)
+ * Intermediate results stay in Python, only the final result is returned.
+ */
+export async function pipeline(
+  input: GeoJSON.FeatureCollection,
+  steps: PipelineStep[]
+): Promise<ProcessResult> {
+  return runAlgorithm('pipeline', { steps }, input);
+}
+
 export default {
   getStatus,
   listAlgorithms,
@@ -198,8 +386,11 @@ export default {
   buffer,
   dissolve,
   simplify,
+  simplifyLevels,
   voronoi,
+  delaunay,
   convexHull,
   centroid,
-  grid
+  grid,
+  pipeline
 };